@@ -15,6 +15,7 @@ document.addEventListener('DOMContentLoaded', function() {
             // Add active class to clicked button and corresponding section
             this.classList.add('active');
             document.getElementById(targetSection).classList.add('active');
+            activateSection(document.getElementById(targetSection));
             
             // Smooth scroll to top of main content
             document.querySelector('.dashboard-main').scrollIntoView({ 
@@ -23,6 +24,339 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // plotly.js (~3.5 MB) is only fetched once a section that draws with it is shown; the page
+    // names the bundle in <body data-plotly="...">
+    const plotlySrc = document.body.dataset.plotly;
+    let plotlyLoading = null;
+
+    function loadPlotly() {
+        if (typeof Plotly !== 'undefined') {
+            return Promise.resolve();
+        }
+        if (!plotlySrc) {
+            return Promise.reject(new Error('plotly.js is not available on this page'));
+        }
+        if (!plotlyLoading) {
+            plotlyLoading = new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = plotlySrc;
+                script.onload = resolve;
+                script.onerror = () => reject(new Error('Could not load ' + plotlySrc));
+                document.head.appendChild(script);
+            });
+        }
+        return plotlyLoading;
+    }
+
+    // Frames carry data-src until their section is first shown; browsers load hidden iframes
+    // eagerly even with loading="lazy", so this keeps them off the first paint
+    function loadFrames(section) {
+        section.querySelectorAll('iframe[data-src]').forEach(frame => {
+            frame.src = frame.dataset.src;
+            frame.removeAttribute('data-src');
+        });
+    }
+
+    function activateSection(section) {
+        loadFrames(section);
+        renderMaps(section);
+        renderDataCharts(section);
+        prefetchWhenIdle(nextSection(section));
+    }
+
+    function nextSection(section) {
+        const position = Array.from(sections).indexOf(section);
+        return position >= 0 && position < sections.length - 1 ? sections[position + 1] : null;
+    }
+
+    const prefetched = new Set();
+
+    function prefetchUrl(url) {
+        if (prefetched.has(url)) {
+            return;
+        }
+        prefetched.add(url);
+        const link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.href = url;
+        document.head.appendChild(link);
+    }
+
+    // Warm the browser cache for the section the reader is likely to open next, once the
+    // page is idle and unless the reader asked to save data
+    function prefetchWhenIdle(section) {
+        if (!section || (navigator.connection && navigator.connection.saveData)) {
+            return;
+        }
+        const idle = window.requestIdleCallback || (callback => setTimeout(callback, 1000));
+        idle(() => {
+            section.querySelectorAll('iframe[data-src]').forEach(frame => prefetchUrl(frame.dataset.src));
+            section.querySelectorAll('.plotly-map').forEach(container => prefetchUrl(container.dataset.spec));
+            if (plotlySrc && typeof Plotly === 'undefined' && section.querySelector('.plotly-map, .data-chart')) {
+                prefetchUrl(plotlySrc);
+            }
+            if (dataApi) {
+                section.querySelectorAll('.data-chart').forEach(container => {
+                    const builder = chartBuilders[container.dataset.chart];
+                    if (builder) {
+                        loadDataset(builder.dataset).catch(() => {});
+                    }
+                });
+            }
+        });
+    }
+
+    // Draw the JSON map specs with the shared plotly.js once their section is visible
+    // (plotly cannot size a plot inside a display:none section)
+    function renderMaps(section) {
+        const containers = section.querySelectorAll('.plotly-map');
+        if (!containers.length) {
+            return;
+        }
+
+        loadPlotly()
+            .then(() => containers.forEach(drawMap))
+            .catch(error => console.warn('Maps left blank', error));
+    }
+
+    function drawMap(container) {
+        if (container.dataset.rendered) {
+            Plotly.Plots.resize(container);
+            return;
+        }
+        container.dataset.rendered = 'true';
+
+        // fetchJson rejects a 404 (a spec that was never built), so it ends in the fallback below
+        fetchJson(container.dataset.spec)
+            .then(spec => {
+                // Region maps point at a shared geometry file, given relative to the spec
+                const specUrl = new URL(container.dataset.spec, document.baseURI);
+                spec.data.forEach(trace => {
+                    if (typeof trace.geojson === 'string') {
+                        trace.geojson = new URL(trace.geojson, specUrl).href;
+                    }
+                });
+                return Plotly.newPlot(container, spec.data, spec.layout, { responsive: true });
+            })
+            .catch(error => {
+                console.error('Could not load map ' + container.dataset.spec, error);
+                container.classList.add('plotly-map-missing');
+                container.textContent = 'This map is not available right now.';
+            });
+    }
+
+    // Precomputed aggregates written by the chart pipeline (scripts/dashboard_data.py); the
+    // page names the API directory in <body data-api="...">
+    const dataApi = document.body.dataset.api;
+    const datasets = {};
+    let dataIndex = null;
+
+    function fetchJson(url, options) {
+        return fetch(url, options).then(response => {
+            if (!response.ok) {
+                throw new Error('HTTP ' + response.status + ' for ' + url);
+            }
+            return response.json();
+        });
+    }
+
+    function loadDataset(name) {
+        if (!dataApi) {
+            return Promise.reject(new Error('No data API configured for this page'));
+        }
+        // The index is revalidated on every visit; each dataset URL carries its content hash,
+        // so a refresh only downloads the datasets whose numbers changed
+        if (!dataIndex) {
+            dataIndex = fetchJson(dataApi + '/index.json', { cache: 'no-cache' });
+        }
+        if (!datasets[name]) {
+            datasets[name] = dataIndex.then(index => {
+                const entry = index.datasets[name];
+                if (!entry) {
+                    throw new Error('Unknown dataset ' + name);
+                }
+                return fetchJson(dataApi + '/' + entry.file + '?v=' + entry.hash);
+            });
+        }
+        return datasets[name];
+    }
+
+    const monthNames = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+
+    function formatPercent(value) {
+        const rounded = Math.round(value);
+        return (rounded > 0 ? '+' : '') + rounded + '%';
+    }
+
+    function periodLabel(period) {
+        const [year, month] = period.split('-');
+        return new Date(Number(year), Number(month) - 1).toLocaleString('en', { month: 'long' }) + ' ' + year;
+    }
+
+    // Card numbers by dataset; each returns the fields a data-metric="dataset:key:field" element can show
+    const cardMetrics = {
+        trajectory: (data, key) => {
+            const values = data.recovery.filter(value => value !== null);
+            if (!values.length) {
+                return null;
+            }
+            const value = key === 'low' ? Math.min(...values) : Math.max(...values);
+            return { value: formatPercent(value), period: periodLabel(data.period[data.recovery.indexOf(value)]) };
+        },
+        sectors: (data, key) => {
+            const position = data.nace_r2.indexOf(key);
+            return position < 0 ? null : { value: formatPercent(data.recovery[position]), name: data.name[position] };
+        },
+        recovery_2024: (data, key) => {
+            const position = Number(key) - 1;
+            return position < data.geo.length
+                ? { value: formatPercent(data.recovery[position]), name: data.name[position] }
+                : null;
+        }
+    };
+
+    // Replace the hand-typed card numbers with the current data; the typed values stay as the
+    // fallback when the data API is missing. data-format wraps the field, e.g. "Peak ({})"
+    function fillCards() {
+        document.querySelectorAll('[data-metric]').forEach(element => {
+            const [name, key, field] = element.dataset.metric.split(':');
+            loadDataset(name)
+                .then(data => {
+                    const metric = cardMetrics[name](data, key);
+                    if (metric && metric[field] !== undefined) {
+                        const format = element.dataset.format || '{}';
+                        element.textContent = format.replace('{}', metric[field]);
+                    }
+                })
+                .catch(error => console.warn('Keeping built-in value for ' + element.dataset.metric, error));
+        });
+    }
+
+    const plotLayout = {
+        paper_bgcolor: '#FAFBFC',
+        plot_bgcolor: '#FAFBFC',
+        font: { family: 'Inter, Helvetica, Arial, sans-serif', color: '#1A1A1A' },
+        margin: { t: 30, r: 20, b: 50, l: 60 },
+        legend: { orientation: 'h', y: -0.15 }
+    };
+
+    function monthlyLines(data, years, colors) {
+        return years
+            .filter(year => data.years.includes(year))
+            .map(year => ({
+                type: 'scatter',
+                mode: 'lines+markers',
+                name: String(year),
+                x: monthNames,
+                y: data.nights[data.years.indexOf(year)],
+                line: { color: colors[year], width: 3 }
+            }));
+    }
+
+    // Client-side versions of the PNG charts, keyed by data-chart
+    const chartBuilders = {
+        trajectory: {
+            dataset: 'trajectory',
+            build: data => ({
+                data: [
+                    { type: 'scatter', mode: 'lines+markers', name: 'EU27', x: data.period, y: data.recovery,
+                      line: { color: '#2E4A6B', width: 4 } },
+                    // Band first, as the fill runs from the lower bound to the upper one
+                    { type: 'scatter', mode: 'lines', x: data.projection.period, y: data.projection.lower,
+                      line: { width: 0 }, showlegend: false, hoverinfo: 'skip' },
+                    { type: 'scatter', mode: 'lines', name: 'Projection (80% range)', x: data.projection.period,
+                      y: data.projection.upper, fill: 'tonexty', fillcolor: 'rgba(46, 74, 107, 0.15)',
+                      line: { width: 0 }, hoverinfo: 'skip' },
+                    { type: 'scatter', mode: 'lines', name: 'Projection', x: data.projection.period,
+                      y: data.projection.forecast, line: { color: '#2E4A6B', width: 3, dash: 'dash' } }
+                ],
+                layout: { yaxis: { title: '% vs same month of 2019', ticksuffix: '%', zeroline: true,
+                                   zerolinecolor: '#8B2635', zerolinewidth: 2 } }
+            })
+        },
+        'country-performance': {
+            dataset: 'recovery_2024',
+            build: data => ({
+                data: [{ type: 'bar', orientation: 'h', x: data.recovery.slice().reverse(), y: data.name.slice().reverse(),
+                         marker: { color: data.recovery.slice().reverse().map(value => value >= 0 ? '#2D5A3D' : '#8B2635') } }],
+                layout: { xaxis: { title: '% vs 2019 (' + data.year + ' average)', ticksuffix: '%' },
+                          margin: { t: 30, r: 20, b: 50, l: 110 } }
+            })
+        },
+        sectors: {
+            dataset: 'sectors',
+            build: data => ({
+                data: [{ type: 'bar', x: data.name, y: data.recovery, marker: { color: ['#2D5A3D', '#4A6B8A', '#2E4A6B'] } }],
+                layout: { yaxis: { title: '% vs 2019 (' + data.year + ' average)', ticksuffix: '%' } }
+            })
+        },
+        residence: {
+            dataset: 'residence',
+            build: data => ({
+                data: [
+                    { type: 'scatter', mode: 'lines', name: 'Domestic', x: data.period, y: data.DOM,
+                      line: { color: '#2E4A6B', width: 3 } },
+                    { type: 'scatter', mode: 'lines', name: 'International', x: data.period, y: data.FOR,
+                      line: { color: '#2D5A3D', width: 3 } }
+                ],
+                layout: { yaxis: { title: '% vs same month of 2019', ticksuffix: '%' } }
+            })
+        },
+        seasonal: {
+            dataset: 'monthly',
+            build: data => ({
+                data: monthlyLines(data, [2019, 2022, 2023, 2024],
+                                   { 2019: '#34495E', 2022: '#F39C12', 2023: '#3498DB', 2024: '#2ECC71' }),
+                layout: { yaxis: { title: 'Nights spent' } }
+            })
+        },
+        'monthly-journey': {
+            dataset: 'monthly',
+            build: data => ({
+                data: monthlyLines(data, [2019, 2020], { 2019: '#2C3E50', 2020: '#C85450' }),
+                layout: { yaxis: { title: 'Nights spent' } }
+            })
+        }
+    };
+
+    // Draw .data-chart containers from the data API once their section is visible, replacing
+    // the PNG they hold as a fallback
+    function renderDataCharts(section) {
+        const containers = section.querySelectorAll('.data-chart');
+        if (!containers.length || !dataApi) {
+            return;
+        }
+
+        loadPlotly()
+            .then(() => containers.forEach(drawDataChart))
+            .catch(error => console.warn('Keeping the chart images', error));
+    }
+
+    function drawDataChart(container) {
+        if (container.dataset.rendered) {
+            Plotly.Plots.resize(container);
+            return;
+        }
+        const builder = chartBuilders[container.dataset.chart];
+        if (!builder) {
+            return;
+        }
+        container.dataset.rendered = 'true';
+
+        loadDataset(builder.dataset)
+            .then(data => {
+                const figure = builder.build(data);
+                container.replaceChildren();
+                container.classList.add('data-chart-live');
+                return Plotly.newPlot(container, figure.data, Object.assign({}, plotLayout, figure.layout),
+                                      { responsive: true, displaylogo: false });
+            })
+            .catch(error => console.warn('Keeping the image for ' + container.dataset.chart, error));
+    }
+
+    document.querySelectorAll('.dashboard-section.active').forEach(activateSection);
+    fillCards();
+
     // Add hover effects to metric cards
     const metricCards = document.querySelectorAll('.metric-card');
     metricCards.forEach(card => {
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import subprocess
+import threading
+import itertools
+import argparse
+import platform
+import tempfile
+import json
+import time
+import math
+import sys
+import os
+
+import professional_simple_charts as charts
+from chart_registry import CHARTS, select_charts
+from tourism_dataset import TourismDataset
+from tourism_cube import AggregateCube
+from plotly_export import flush_exports
+from run_metrics import current_rss, peak_rss
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+BENCH_DATA_DIR = os.path.join(script_dir, '..', 'data', 'bench')
+RESULTS_DIR = os.path.join(script_dir, '..', 'data', 'benchmarks')
+
+SCALES = {'10k': 10_000, '1M': 1_000_000, '10M': 10_000_000}
+
+# Bump whenever generate_csv() changes what it writes, so files generated earlier are not reused
+SYNTHETIC_VERSION = 2
+
+# Header of the Eurostat SDMX-CSV (linear) export, so load_data() sees the real layout
+CSV_HEADER = ['STRUCTURE', 'STRUCTURE_ID', 'STRUCTURE_NAME', 'freq', 'Time frequency', 'c_resid',
+              'Country of residence', 'unit', 'Unit of measure', 'nace_r2', 'Statistical classification',
+              'geo', 'Geopolitical entity (reporting)', 'TIME_PERIOD', 'Time', 'OBS_VALUE', 'Observation value',
+              'OBS_FLAG', 'Observation flag', 'CONFIDENTIALITY', 'Confidentiality status (flag)']
+PERIODS = [f'{year}-{month:02d}' for year in range(2015, 2025) for month in range(1, 13)]
+
+# (c_resid, unit, nace_r2) of each series, the ones the charts read first. Only nights (NR):
+# recovery is derived from them, so nothing reads the published PCH_SM_19 rows
+CHART_COMBOS = [('TOTAL', 'NR', 'I551-I553'), ('DOM', 'NR', 'I551-I553'), ('FOR', 'NR', 'I551-I553'),
+                ('TOTAL', 'NR', 'I551'), ('TOTAL', 'NR', 'I552'), ('TOTAL', 'NR', 'I553')]
+SERIES_COMBOS = CHART_COMBOS + [combo for combo in itertools.product(['TOTAL', 'DOM', 'FOR'], ['NR'],
+                                                                     ['I551-I553', 'I551', 'I552', 'I553'])
+                                if combo not in CHART_COMBOS]
+GENERATE_CHUNK_SERIES = 4000
+
+# Flags a stage as slower in --compare when it takes this much longer than the baseline
+REGRESSION_RATIO = 1.2
+
+def synthetic_geos(n_series):
+    # EU27_2020 and the member states first, then as many made-up regions as the row count needs
+    geos = ['EU27_2020'] + charts.EU27_GEOS
+    n_geos = max(len(geos), math.ceil(n_series / len(SERIES_COMBOS)))
+    return geos + [f'R{i:05d}' for i in range(n_geos - len(geos))]
+
+def generate_csv(path, rows, seed=0):
+    # Series are laid out combination-major, so even the smallest file covers the main chart
+    # combinations across every EU country before it adds regions
+    rng = np.random.default_rng(seed)
+    n_series = math.ceil(rows / len(PERIODS))
+    geos = np.array(synthetic_geos(n_series), dtype=object)
+    combos = np.array(SERIES_COMBOS, dtype=object)
+    periods = np.array(PERIODS, dtype=object)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    written = 0
+    with open(tmp_path, 'w', newline='') as f:
+        f.write(','.join(CSV_HEADER) + '\n')
+        for first in range(0, n_series, GENERATE_CHUNK_SERIES):
+            series = np.arange(first, min(first + GENERATE_CHUNK_SERIES, n_series))
+            combo = combos[series // len(geos)]
+            n_rows = min(len(series) * len(PERIODS), rows - written)
+            repeat = lambda values: np.repeat(values, len(PERIODS))[:n_rows]
+
+            obs_value = rng.lognormal(14, 1.5, n_rows).round(0).astype(str)
+            obs_value[rng.random(n_rows) < 0.01] = ':'
+
+            chunk = pd.DataFrame({
+                'STRUCTURE': 'dataflow', 'STRUCTURE_ID': 'ESTAT:TOUR_OCC_NIM(1.0)',
+                'STRUCTURE_NAME': 'Nights spent at tourist accommodation establishments',
+                'freq': 'M', 'Time frequency': 'Monthly',
+                'c_resid': repeat(combo[:, 0]), 'Country of residence': '',
+                'unit': repeat(combo[:, 1]), 'Unit of measure': '',
+                'nace_r2': repeat(combo[:, 2]), 'Statistical classification': '',
+                'geo': repeat(geos[series % len(geos)]), 'Geopolitical entity (reporting)': '',
+                'TIME_PERIOD': np.tile(periods, len(series))[:n_rows], 'Time': '',
+                'OBS_VALUE': obs_value, 'Observation value': '',
+                'OBS_FLAG': '', 'Observation flag': '', 'CONFIDENTIALITY': '', 'Confidentiality status (flag)': '',
+            }, columns=CSV_HEADER)
+            chunk.to_csv(f, header=False, index=False)
+            written += n_rows
+    os.replace(tmp_path, path)
+    return path
+
+def dataset_file(label, rows, seed=0):
+    # Generated once per (rows, seed) and reused by later runs
+    path = os.path.join(BENCH_DATA_DIR, f'synthetic_v{SYNTHETIC_VERSION}_{label}_s{seed}.csv')
+    if not os.path.exists(path):
+        print(f"Generating {label} synthetic rows -> {os.path.relpath(path)}")
+        generate_csv(path, rows, seed)
+    return path
+
+class PeakRSS:
+    # Samples RSS in a background thread for the duration of a with-block. Without /proc it
+    # falls back to the process high-water mark, which can only grow between stages; None
+    # where neither can be read
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self.stop = threading.Event()
+
+    def sample(self):
+        while not self.stop.is_set():
+            self.peak = max(self.peak, current_rss() or 0)
+            self.stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = current_rss()
+        if self.start_rss is not None:
+            self.peak = self.start_rss
+            self.thread = threading.Thread(target=self.sample, daemon=True)
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start_rss is not None:
+            self.stop.set()
+            self.thread.join()
+            self.peak = max(self.peak, current_rss() or 0)
+        else:
+            self.peak = peak_rss()
+        return False
+
+def measure(results, scale, stage, func, chart=None):
+    with PeakRSS() as memory:
+        start = time.perf_counter()
+        value = func()
+        seconds = time.perf_counter() - start
+    entry = {'scale': scale, 'stage': stage, 'chart': chart, 'seconds': round(seconds, 4),
+             'peak_rss_mb': round(memory.peak / 2**20, 1) if memory.peak is not None else None}
+    results.append(entry)
+    label = f"{stage} {chart}" if chart else stage
+    peak = f"{entry['peak_rss_mb']:8.1f} MB" if entry['peak_rss_mb'] is not None else 'n/a'
+    print(f"  {label:<32} {seconds:8.3f}s  peak {peak}")
+    return value
+
+def bench_scale(label, rows, results, seed=0, selected=CHARTS):
+    path = dataset_file(label, rows, seed)
+    print(f"\n{label}: {os.path.getsize(path) / 2**20:.0f} MB CSV")
+
+    df = measure(results, label, 'load', lambda: charts.load_data(path))
+    dataset = measure(results, label, 'index', lambda: TourismDataset(df))
+    loaded = list(dataset.df.columns)
+    del df
+
+    for entry in selected:
+        if entry['needs']:
+            continue
+        name, func = entry['name'], entry['func']
+
+        # Untimed warm-up render: records which rollups the chart asks for and pays the
+        # one-off font and plotly import costs before anything is measured
+        probe = AggregateCube(dataset)
+        probe.start_recording()
+        func(probe)
+        flush_exports()
+        specs = probe.stop_recording()
+
+        # The warm-up derived the chart's indicator columns; drop them so the dataset is as
+        # loaded again and deriving them is timed on its own, ahead of the aggregates
+        dataset.df.drop(columns=[column for column in dataset.df.columns if column not in loaded], inplace=True)
+        derived = [measure_name for measure_name in dict.fromkeys(spec['measure'] for spec in specs)
+                   if measure_name not in loaded]
+        if derived:
+            measure(results, label, 'derive', lambda: [dataset.add_measure(measure_name) for measure_name in derived], name)
+
+        cube = AggregateCube(dataset)
+        measure(results, label, 'aggregate', lambda: [cube.rollup_from_spec(spec) for spec in specs], name)
+        measure(results, label, 'render', lambda: func(cube), name)
+        if any('{map}' in output for output in entry['outputs']):
+            measure(results, label, 'export', flush_exports, name)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=script_dir, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment():
+    import matplotlib
+    return {
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def compare(results, baseline):
+    # Per-stage timing against a previous results file
+    previous = {(entry['scale'], entry['stage'], entry['chart']): entry for entry in baseline['results']}
+    print(f"\nCompared with {baseline['environment'].get('commit') or 'baseline'}:")
+    for entry in results:
+        old = previous.get((entry['scale'], entry['stage'], entry['chart']))
+        if not old or old['seconds'] <= 0:
+            continue
+        ratio = entry['seconds'] / old['seconds']
+        flag = '  SLOWER' if ratio > REGRESSION_RATIO else ''
+        label = f"{entry['scale']} {entry['stage']} {entry['chart'] or ''}".strip()
+        print(f"  {label:<40} {old['seconds']:8.3f}s -> {entry['seconds']:8.3f}s  x{ratio:5.2f}{flag}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time and measure ingest, aggregation and rendering on synthetic data.')
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=list(SCALES),
+                        help='synthetic dataset sizes to run (default: all)')
+    parser.add_argument('--only', nargs='+', metavar='CHART', help='benchmark only these charts')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the synthetic data')
+    parser.add_argument('--output', help='results JSON (default: data/benchmarks/<time>_<commit>.json)')
+    parser.add_argument('--compare', metavar='BASELINE', help='print per-stage timing against an earlier results file')
+    args = parser.parse_args(argv)
+
+    try:
+        selected = select_charts(CHARTS, args.only)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    env = environment()
+    results = []
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        # Charts write into a scratch directory so benchmarking never touches the dashboard assets
+        # (an images/ subdirectory, as the data API writes next to it in ../data)
+        charts.OUTPUT_DIR = os.path.join(scratch_dir, 'images')
+        os.makedirs(charts.OUTPUT_DIR)
+        for label in args.scales:
+            bench_scale(label, SCALES[label], results, args.seed, selected)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}_{env['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'environment': env, 'results': results}, f, indent=2)
+    print(f"\nSaved {len(results)} measurements to {os.path.relpath(output)}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
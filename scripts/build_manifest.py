@@ -0,0 +1,98 @@
+import pandas as pd
+import importlib
+import hashlib
+import inspect
+import json
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = os.path.join(script_dir, '..', 'data', 'build_manifest.json')
+MANIFEST_VERSION = 1
+
+def load_manifest(path=MANIFEST_FILE):
+    if not os.path.exists(path):
+        return {'version': MANIFEST_VERSION, 'charts': {}}
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'version': MANIFEST_VERSION, 'charts': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'charts': {}}
+    return manifest
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def resolve_helper(func, name):
+    # A function of the chart's own module, else a module imported by name
+    return func.__globals__.get(name) or importlib.import_module(name)
+
+def params_hash(func, style, helpers=()):
+    # The chart's own source, the source of the helpers it draws with, plus the shared style
+    # settings
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(inspect.getsource(func).encode())
+    for name in helpers:
+        digest.update(inspect.getsource(resolve_helper(func, name)).encode())
+    digest.update(json.dumps(style, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def job_style(style, job_styles, name):
+    # Settings that only one chart draws with (e.g. the NUTS map geometry) join its style alone,
+    # so changing them does not invalidate every other chart
+    if job_styles and name in job_styles:
+        return dict(style, job=job_styles[name])
+    return style
+
+def inputs_hash(cube, rollups):
+    # Hash of every aggregate the chart consumed, replayed through the (memoized) cube
+    digest = hashlib.blake2b(digest_size=16)
+    for spec in rollups:
+        result = cube.rollup_from_spec(spec)
+        digest.update(json.dumps(spec, sort_keys=True).encode())
+        digest.update(pd.util.hash_pandas_object(result.reset_index(), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def plan_rebuild(manifest, jobs, cube, output_dir, style, job_styles=None, unaffected=(), job_helpers=None):
+    # Splits jobs into (to_render, skipped); jobs are (name, func, outputs) triples and
+    # job_helpers maps a job to its chart's helpers (see chart_registry.py). Charts in
+    # unaffected are known to read none of the changed data (see delta_ingest.py), so their
+    # aggregates are not replayed
+    to_render = []
+    skipped = []
+    for name, func, outputs in jobs:
+        entry = manifest['charts'].get(name)
+        if (entry is None
+                or entry.get('outputs') != list(outputs)
+                or not all(os.path.exists(os.path.join(output_dir, output)) for output in outputs)
+                or entry.get('params_hash') != params_hash(func, job_style(style, job_styles, name),
+                                                           (job_helpers or {}).get(name, ()))
+                or (name not in unaffected
+                    and entry.get('inputs_hash') != inputs_hash(cube, entry.get('rollups', [])))):
+            to_render.append((name, func, outputs))
+        else:
+            skipped.append(name)
+    return to_render, skipped
+
+def record_results(manifest, jobs, results, cube, style, job_styles=None, job_helpers=None):
+    job_lookup = {name: (func, outputs) for name, func, outputs in jobs}
+    for result in results:
+        func, outputs = job_lookup[result['name']]
+        if not result['ok'] or result.get('incomplete'):
+            # Failed, or an output was not written (e.g. a map PNG without Kaleido): the chart is
+            # left out so the next run renders it again
+            manifest['charts'].pop(result['name'], None)
+            continue
+        manifest['charts'][result['name']] = {
+            'outputs': list(outputs),
+            'rollups': result['rollups'],
+            'inputs_hash': inputs_hash(cube, result['rollups']),
+            'params_hash': params_hash(func, job_style(style, job_styles, result['name']),
+                                       (job_helpers or {}).get(result['name'], ())),
+        }
+    return manifest
@@ -0,0 +1,35 @@
+# Every chart in render order. Entries are dicts with:
+#   name     short name used by --only/--exclude/--list
+#   func     the chart function, called with the AggregateCube
+#   message  progress line printed before a serial render
+#   outputs  files written under OUTPUT_DIR; '{map}' expands to each map format
+#   data     dimension values the chart reads, {column: [values]}; a column left out is
+#            read in full
+#   needs    optional name of a run setting the chart cannot render without
+#   helpers  names of the functions (in the chart's module) and modules the chart draws with;
+#            their source joins the chart's own in the build manifest's params hash
+CHARTS = []
+
+def chart(name, message, outputs, data, needs=None, helpers=()):
+    def register(func):
+        if any(entry['name'] == name for entry in CHARTS):
+            raise ValueError(f"Chart name registered twice: {name}")
+        CHARTS.append({'name': name, 'func': func, 'message': message, 'outputs': list(outputs),
+                       'data': data, 'needs': needs, 'helpers': list(helpers)})
+        return func
+    return register
+
+def select_charts(charts, only=None, exclude=None):
+    names = [entry['name'] for entry in charts]
+    unknown = [name for name in (only or []) + (exclude or []) if name not in names]
+    if unknown:
+        raise ValueError(f"Unknown chart(s): {', '.join(unknown)} (available: {', '.join(names)})")
+    return [entry for entry in charts
+            if (not only or entry['name'] in only) and entry['name'] not in (exclude or [])]
+
+def merge_data(slices):
+    # Union of the given data slices; a column any slice leaves unrestricted stays unrestricted
+    if not slices:
+        return {}
+    columns = set.intersection(*(set(data) for data in slices))
+    return {column: sorted({value for data in slices for value in data[column]}) for column in sorted(columns)}
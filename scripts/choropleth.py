@@ -0,0 +1,32 @@
+import pandas as pd
+import numpy as np
+
+# A classification is {'edges': [...], 'right': bool, 'labels': {column: [label per bin]}}.
+# edges are the inner bin boundaries in ascending order; right=True closes each bin on its
+# upper edge (x <= edge), right=False on its lower edge (x >= edge). Each labels list has
+# one entry per bin, lowest bin first.
+
+def classify(values, classification):
+    # Bin number of every value, from 0 for the lowest bin
+    edges = np.concatenate([[-np.inf], classification['edges'], [np.inf]])
+    return pd.cut(values, edges, right=classification.get('right', True), labels=False)
+
+def build_map_frame(values, value_column, classification, locations, names, display_format,
+                    location_column='iso_alpha'):
+    # values: Series of the mapped measure indexed by geo code. Codes missing from locations
+    # are dropped; every other column is derived from whole-column operations
+    values = values[values.index.isin(list(locations))]
+    geo = pd.Series(values.index.astype(str), index=values.index)
+
+    map_df = pd.DataFrame({
+        location_column: geo.map(locations),
+        'country': geo.map(names).fillna(geo),
+        value_column: values,
+    })
+
+    bins = classify(values, classification).to_numpy()
+    for column, labels in classification['labels'].items():
+        map_df[column] = np.asarray(labels, dtype=object)[bins]
+
+    map_df[value_column + '_display'] = values.map(display_format.format)
+    return map_df.reset_index(drop=True)
@@ -0,0 +1,57 @@
+from run_metrics import metrics
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+
+# Bump whenever a dataset's layout changes; the dashboard reads data/v{DATA_API_VERSION}/
+DATA_API_VERSION = 1
+INDEX_NAME = 'index.json'
+
+# Percentages and night counts; two decimals is finer than anything the dashboard shows
+VALUE_DECIMALS = 2
+
+def column(values, decimals=VALUE_DECIMALS):
+    # JSON-ready list of a series or array; NaN becomes null, whole numbers stay integers
+    array = np.asarray(values, dtype=float).round(decimals)
+    number = int if decimals == 0 else float
+    return [None if np.isnan(value) else number(value) for value in array]
+
+def periods(dates):
+    return [date.strftime('%Y-%m') for date in pd.to_datetime(dates)]
+
+def dataset_file(name):
+    return f"{name}.json"
+
+def write_if_changed(payload, path):
+    # Unchanged files keep their mtime, so browsers and CDNs can keep serving cached copies
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
+def write_datasets(datasets, data_dir):
+    # One compact JSON file per dataset plus an index with each file's content hash; the
+    # dashboard fetches the index first and requests every file with ?v=<hash>, so a refresh
+    # only re-downloads the datasets whose numbers changed
+    index = {'version': DATA_API_VERSION, 'datasets': {}}
+    written = 0
+    for name, data in datasets.items():
+        path = os.path.join(data_dir, dataset_file(name))
+        payload = json.dumps(data, separators=(',', ':'), allow_nan=False).encode()
+        with metrics.stage('write_json', path):
+            written += write_if_changed(payload, path)
+        index['datasets'][name] = {'file': dataset_file(name), 'hash': hashlib.blake2b(payload, digest_size=8).hexdigest(),
+                                   'bytes': len(payload)}
+
+    path = os.path.join(data_dir, INDEX_NAME)
+    with metrics.stage('write_json', path):
+        written += write_if_changed(json.dumps(index, indent=1, sort_keys=True).encode(), path)
+    return written
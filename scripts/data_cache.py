@@ -0,0 +1,136 @@
+import pandas as pd
+import hashlib
+import json
+import time
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(script_dir, '..', 'data', 'cache')
+INDEX_FILE = 'index.json'
+
+# Bump whenever load_data() changes the shape or dtypes of the cleaned frame
+CACHE_VERSION = 2
+
+def cache_format():
+    try:
+        import pyarrow  # noqa: F401
+        return 'parquet'
+    except ImportError:
+        return 'pickle'
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_index(cache_dir=CACHE_DIR):
+    index_path = os.path.join(cache_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_index(index, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    index_path = os.path.join(cache_dir, INDEX_FILE)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+def source_fingerprint(data_file, index):
+    # size + mtime are checked first; the content hash is only recomputed when they differ
+    # from the recorded entry, so an unchanged file costs one stat() call
+    stat = os.stat(data_file)
+    entry = index.get(os.path.abspath(data_file), {})
+
+    if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        content_hash = entry['content_hash']
+    else:
+        content_hash = hash_file(data_file)
+
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'content_hash': content_hash}
+
+def cache_file_name(fingerprint, fmt):
+    extension = 'parquet' if fmt == 'parquet' else 'pkl'
+    return f"clean_v{CACHE_VERSION}_{fingerprint['content_hash']}.{extension}"
+
+def select_rows(df, keep):
+    # keep: {column: [values]}; rows whose value in any listed column is not listed are dropped
+    if not keep:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, values in keep.items():
+        mask &= df[column].isin(values)
+    return df[mask]
+
+def read_frame(path, keep=None):
+    if path.endswith('.parquet'):
+        # Row-group statistics and dictionary pages let pyarrow skip what keep rules out
+        filters = [(column, 'in', list(values)) for column, values in keep.items()] if keep else None
+        return pd.read_parquet(path, filters=filters)
+    return select_rows(pd.read_pickle(path), keep)
+
+def write_frame(df, path):
+    tmp_path = path + '.tmp'
+    if path.endswith('.parquet'):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+def load_cached(data_file, loader, rebuild=False, cache_dir=CACHE_DIR, keep=None):
+    # The whole cleaned frame is cached; keep only narrows what is read back
+    if not os.path.exists(data_file):
+        raise FileNotFoundError(f"Data file not found: {data_file}")
+
+    index = read_index(cache_dir)
+    fingerprint = source_fingerprint(data_file, index)
+    cache_name = cache_file_name(fingerprint, cache_format())
+    cache_path = os.path.join(cache_dir, cache_name)
+
+    if not rebuild and os.path.exists(cache_path):
+        try:
+            df = read_frame(cache_path, keep)
+            # Content unchanged but the file was touched: refresh size/mtime so the next run skips hashing
+            if index.get(os.path.abspath(data_file), {}).get('mtime_ns') != fingerprint['mtime_ns']:
+                index[os.path.abspath(data_file)] = dict(fingerprint, cache_file=cache_name, created=time.time())
+                write_index(index, cache_dir)
+            return df
+        except Exception as e:
+            print(f"Ignoring unreadable cache {cache_name}: {e}")
+
+    df = loader(data_file)
+    os.makedirs(cache_dir, exist_ok=True)
+    write_frame(df, cache_path)
+    index[os.path.abspath(data_file)] = dict(fingerprint, cache_file=cache_name, created=time.time())
+    write_index(index, cache_dir)
+    return select_rows(df, keep)
+
+def prune_cache(max_age_days=None, cache_dir=CACHE_DIR):
+    # Drops cache files no longer referenced by a live source entry, plus entries older than max_age_days
+    if not os.path.isdir(cache_dir):
+        return []
+
+    index = read_index(cache_dir)
+    now = time.time()
+    for source, entry in list(index.items()):
+        expired = max_age_days is not None and now - entry.get('created', 0) > max_age_days * 86400
+        if expired or not os.path.exists(source):
+            del index[source]
+
+    referenced = {entry['cache_file'] for entry in index.values()}
+    removed = []
+    for name in os.listdir(cache_dir):
+        if name == INDEX_FILE or name in referenced:
+            continue
+        os.remove(os.path.join(cache_dir, name))
+        removed.append(name)
+
+    write_index(index, cache_dir)
+    return removed
@@ -0,0 +1,141 @@
+from tourism_indicators import parse_indicator
+from data_cache import cache_format, read_frame, write_frame
+from eurostat_reader import concat_frames
+import pandas as pd
+import numpy as np
+import json
+import time
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(script_dir, '..', 'data', 'store')
+STORE_INDEX = 'store.json'
+
+# One observation; the cleaned frame carries time_period as date
+OBSERVATION_KEY = ['c_resid', 'unit', 'nace_r2', 'geo']
+
+# Room for every month up to year 9999 in the combined key
+MONTH_KEYS = 12 * 10000
+
+# Unit of change reported and matched against the charts' rollups
+PARTITION_COLUMNS = ['unit', 'nace_r2', 'c_resid', 'geo', 'year']
+
+def store_path(store_dir=STORE_DIR):
+    extension = 'parquet' if cache_format() == 'parquet' else 'pkl'
+    return os.path.join(store_dir, f'observations.{extension}')
+
+def load_store(store_dir=STORE_DIR):
+    # The stored cleaned frame, None before the first delta ingest
+    path = store_path(store_dir)
+    if not os.path.exists(path):
+        return None
+    return read_frame(path)
+
+def save_store(df, summary, store_dir=STORE_DIR):
+    os.makedirs(store_dir, exist_ok=True)
+    write_frame(df, store_path(store_dir))
+    index_path = os.path.join(store_dir, STORE_INDEX)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(dict(summary, rows=len(df), written=time.time()), f, indent=2, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+def observation_keys(stored, incoming):
+    # One int64 per row for both frames: each key column's codes against the union of the two
+    # frames' categories, then the month count since year 0
+    stored_keys = np.zeros(len(stored), dtype=np.int64)
+    incoming_keys = np.zeros(len(incoming), dtype=np.int64)
+    for col in OBSERVATION_KEY:
+        categories = pd.Categorical(stored[col]).categories.union(pd.Categorical(incoming[col]).categories)
+        stored_keys = stored_keys * len(categories) + pd.Categorical(stored[col], categories=categories).codes
+        incoming_keys = incoming_keys * len(categories) + pd.Categorical(incoming[col], categories=categories).codes
+    months = lambda df: df['year'].to_numpy().astype(np.int64) * 12 + df['month'].to_numpy().astype(np.int64) - 1
+    return stored_keys * MONTH_KEYS + months(stored), incoming_keys * MONTH_KEYS + months(incoming)
+
+def diff_frames(stored, incoming):
+    # Row positions of the inserts and updates in incoming and of the deletes in stored; an
+    # observation missing from the new extract counts as deleted
+    if incoming['obs_value'].dtype != np.float64:
+        # float32 steps by 32 around 3e8 nights, so a one-night revision would read as unchanged
+        raise ValueError("obs_value must be float64 to detect revisions to large counts")
+    stored_keys, incoming_keys = observation_keys(stored, incoming)
+    index = pd.Index(stored_keys)
+    if not index.is_unique or not pd.Index(incoming_keys).is_unique:
+        raise ValueError("Observation keys must be unique in both the stored data and the new extract")
+    matches = index.get_indexer(incoming_keys)
+    found = matches >= 0
+
+    # A store written by a float32 build differs from the exact values and is corrected here
+    old_values = stored['obs_value'].to_numpy(dtype=np.float64)[matches[found]]
+    new_values = incoming['obs_value'].to_numpy()[found]
+    changed = np.zeros(len(incoming), dtype=bool)
+    changed[found] = old_values != new_values
+
+    kept = np.zeros(len(stored), dtype=bool)
+    kept[matches[found]] = True
+    return {
+        'inserted': np.flatnonzero(~found),
+        'updated': np.flatnonzero(changed),
+        'replaced': matches[changed],
+        'deleted': np.flatnonzero(~kept),
+    }
+
+def apply_delta(stored, incoming, delta):
+    # Stored rows minus the deleted and replaced ones, plus the updated and inserted rows
+    drop = np.zeros(len(stored), dtype=bool)
+    drop[delta['deleted']] = True
+    drop[delta['replaced']] = True
+    upserts = incoming.iloc[np.sort(np.concatenate([delta['updated'], delta['inserted']]))]
+    return concat_frames([stored[~drop], upserts]).reset_index(drop=True)
+
+def changed_partitions(stored, incoming, delta):
+    # Distinct (unit, nace_r2, c_resid, geo, year) of every inserted, updated or deleted row
+    parts = [incoming.iloc[delta['inserted']], incoming.iloc[delta['updated']], stored.iloc[delta['deleted']]]
+    rows = pd.concat([part[PARTITION_COLUMNS].astype({col: str for col in PARTITION_COLUMNS[:-1]}) for part in parts],
+                     ignore_index=True)
+    return rows.drop_duplicates().sort_values(PARTITION_COLUMNS).reset_index(drop=True)
+
+def spec_affected(spec, partitions):
+    # Whether any changed partition falls inside a recorded rollup's filters. Indicators and
+    # forecasts read whole series (baseline months, history), so their year filters are ignored
+    mask = np.ones(len(partitions), dtype=bool)
+    filters = spec['filters']
+    for col in PARTITION_COLUMNS[:-1]:
+        value = filters.get(col)
+        if value is not None:
+            mask &= partitions[col].isin([value] if isinstance(value, str) else value).to_numpy()
+    if parse_indicator(spec['measure']) is None:
+        years = partitions['year'].to_numpy()
+        if filters.get('years') is not None:
+            wanted = filters['years']
+            mask &= np.isin(years, [wanted] if isinstance(wanted, int) else wanted)
+        elif filters.get('year_range') is not None:
+            first, last = filters['year_range']
+            mask &= (years >= first) & (years <= last)
+    return bool(mask.any())
+
+def affected_charts(manifest, partitions):
+    # {chart: affected rollups} for every chart of the manifest touched by the change, and the
+    # number of distinct recorded rollups that are affected
+    affected = {}
+    specs = {}
+    for name, entry in manifest['charts'].items():
+        for spec in entry.get('rollups', []):
+            key = json.dumps(spec, sort_keys=True)
+            if key not in specs:
+                specs[key] = spec_affected(spec, partitions)
+            if specs[key]:
+                affected.setdefault(name, []).append(spec)
+    return affected, sum(specs.values()), len(specs)
+
+def delta_summary(delta, partitions, source):
+    return {'source': os.path.abspath(source), 'inserted': len(delta['inserted']), 'updated': len(delta['updated']),
+            'deleted': len(delta['deleted']), 'partitions': len(partitions)}
+
+def describe_partitions(partitions, limit=10):
+    # 'NR I551-I553 TOTAL ES 2023' lines, most recent years first
+    recent = partitions.sort_values('year', ascending=False, kind='stable').head(limit)
+    lines = [' '.join(str(value) for value in row) for row in recent.itertuples(index=False)]
+    if len(partitions) > limit:
+        lines.append(f"... and {len(partitions) - limit} more")
+    return lines
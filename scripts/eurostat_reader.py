@@ -0,0 +1,174 @@
+from pandas.api.types import union_categoricals
+import pandas as pd
+import numpy as np
+import gzip
+import re
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(script_dir, '..', 'data', 'tour_occ_nim__custom_19389427_linear_2_0.csv')
+
+# Fields we use, found by header name in SDMX-CSV exports and by key name in bulk TSV downloads
+COLUMN_NAMES = ['c_resid', 'unit', 'nace_r2', 'geo', 'time_period', 'obs_value']
+DIMENSION_COLUMNS = ['c_resid', 'unit', 'nace_r2', 'geo']
+
+# Wide bulk-TSV rows held in memory at once; each expands to one long row per period
+BULK_CHUNK_ROWS = 20_000
+
+# Eurostat observation flags (p provisional, e estimated, b break, ...) trail the value after a space
+FLAG_CHARS = ' abcdefghijklmnopqrstuvwxyz'
+
+def compression(path):
+    # gzip is detected from the magic bytes, so a misnamed file still reads; pandas then
+    # decompresses as it parses, without writing a decompressed copy
+    with open(path, 'rb') as f:
+        return 'gzip' if f.read(2) == b'\x1f\x8b' else None
+
+def open_text(path):
+    return gzip.open(path, 'rt', newline='') if compression(path) == 'gzip' else open(path, newline='')
+
+def first_line(path):
+    with open_text(path) as f:
+        return f.readline().rstrip('\r\n')
+
+def is_bulk_tsv(header):
+    # Bulk downloads start with a combined key such as 'freq,unit,geo\TIME_PERIOD' and tab-separated periods
+    return '\t' in header and '\\' in header.split('\t', 1)[0]
+
+def column_code(name):
+    # SDMX-CSV headers are either bare codes ('geo') or 'code: label' ('geo: Geopolitical entity')
+    return name.split(':', 1)[0].strip().lower()
+
+def sdmx_columns(header, dimensions):
+    # Header name of each column we read, keyed by dimensions + time_period + obs_value
+    wanted = list(dimensions) + ['time_period', 'obs_value']
+    found = {}
+    for name in header:
+        code = column_code(name)
+        if code in wanted and code not in found:
+            found[code] = name
+    missing = [code for code in wanted if code not in found]
+    if missing:
+        raise ValueError(f"SDMX-CSV header has no column for {', '.join(missing)}")
+    return {code: found[code] for code in wanted}
+
+def period_label(label):
+    # '2024-03' stays; the older bulk layout writes '2024M03'
+    label = label.strip()
+    match = re.fullmatch(r'(\d{4})M(\d{2})', label)
+    return f"{match.group(1)}-{match.group(2)}" if match else label
+
+def empty_frame(dimensions):
+    data = {name: pd.Categorical([]) for name in list(dimensions) + ['time_period']}
+    data['obs_value'] = pd.Series([], dtype='float64')
+    return pd.DataFrame(data)
+
+def read_sdmx_csv(path, dimensions, keep=None, chunksize=None):
+    keep = keep or {}
+    header = pd.read_csv(path, nrows=0, compression=compression(path)).columns
+    columns = sdmx_columns(header, dimensions)
+    codes = {source: code for code, source in columns.items()}
+    # A fixed category list reads every value outside keep as NaN, which is the filter
+    dtypes = {columns[name]: pd.CategoricalDtype(keep[name]) if name in keep else 'category'
+              for name in list(dimensions) + ['time_period']}
+    kept_sources = [columns[name] for name in dimensions if name in keep]
+
+    reader = pd.read_csv(path, usecols=list(columns.values()), dtype=dtypes, na_values=[':'],
+                         compression=compression(path), chunksize=chunksize)
+    for raw_df in [reader] if chunksize is None else reader:
+        if kept_sources:
+            raw_df = raw_df.dropna(subset=kept_sources)
+        raw_df.columns = [codes[source] for source in raw_df.columns]
+        yield raw_df
+
+def read_bulk_tsv(path, dimensions, keep=None, chunksize=BULK_CHUNK_ROWS):
+    # Wide layout: one row per series with the dimension codes in one comma-joined key,
+    # then one column per period. Each block of rows is split, filtered on keep and
+    # reshaped to long form with array operations before the next block is read.
+    keep = keep or {}
+    header = first_line(path).split('\t')
+    key_names = [column_code(name) for name in header[0].split('\\', 1)[0].split(',')]
+    missing = [name for name in dimensions if name not in key_names]
+    if missing:
+        raise ValueError(f"Bulk TSV key has no {', '.join(missing)} dimension")
+    periods = [period_label(label) for label in header[1:]]
+
+    reader = pd.read_csv(path, sep='\t', dtype=str, na_filter=False, compression=compression(path),
+                         chunksize=chunksize or BULK_CHUNK_ROWS)
+    for wide in reader:
+        keys = wide.iloc[:, 0].str.split(',', expand=True)
+        keys.columns = key_names
+        mask = np.ones(len(wide), dtype=bool)
+        for name, values in keep.items():
+            if name in keys:
+                mask &= keys[name].isin(values).to_numpy()
+        keys = keys[mask]
+        cells = wide.iloc[mask, 1:].to_numpy().ravel()
+
+        # Row-major: each kept series contributes one cell per period, in header order
+        values = pd.to_numeric(pd.Series(cells, dtype=object).str.rstrip(FLAG_CHARS), errors='coerce').to_numpy()
+        observed = ~np.isnan(values)
+        n_periods = len(periods)
+
+        data = {}
+        for name in dimensions:
+            codes = pd.Categorical(keys[name].str.strip())
+            data[name] = pd.Categorical.from_codes(np.repeat(codes.codes, n_periods)[observed], codes.categories)
+        data['time_period'] = pd.Categorical.from_codes(np.tile(np.arange(n_periods), len(keys))[observed],
+                                                        pd.Index(periods).astype(str))
+        data['obs_value'] = values[observed]
+        yield pd.DataFrame(data)
+
+def read_eurostat(path, dimensions, keep=None, chunksize=None):
+    # Raw frames with columns dimensions + time_period + obs_value from an SDMX-CSV or bulk TSV,
+    # plain or gzipped; always yields at least one (possibly empty) frame
+    reader = read_bulk_tsv if is_bulk_tsv(first_line(path)) else read_sdmx_csv
+    empty = True
+    for raw_df in reader(path, dimensions, keep, chunksize):
+        empty = False
+        yield raw_df
+    if empty:
+        yield empty_frame(dimensions)
+
+def concat_frames(frames):
+    # Categoricals from separate chunks have different category lists; union them instead of
+    # letting concat fall back to object columns
+    if len(frames) == 1:
+        return frames[0]
+    data = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            data[column] = pd.Series(union_categoricals(parts))
+        else:
+            data[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(data)
+
+def parse_time_period(time_period):
+    # Parse each distinct 'YYYY-MM' label once and broadcast through the category codes
+    time_period = time_period.astype('category')
+    periods = pd.to_datetime(time_period.cat.categories, format='%Y-%m', errors='coerce')
+    codes = time_period.cat.codes.to_numpy()
+
+    # Code -1 (missing label) picks the trailing NaT
+    dates = np.append(periods.values, np.array(['NaT'], dtype=periods.values.dtype))
+    return pd.Series(dates[codes], index=time_period.index)
+
+def clean_frame(raw_df):
+    clean_df = raw_df[COLUMN_NAMES]
+
+    # float64, not float32: monthly nights run to hundreds of millions, past float32's exact integers
+    clean_df['obs_value'] = pd.to_numeric(clean_df['obs_value'], errors='coerce').astype('float64')
+    clean_df['date'] = parse_time_period(clean_df['time_period'])
+    clean_df = clean_df.dropna(subset=['date', 'obs_value'])
+    clean_df['year'] = clean_df['date'].dt.year.astype('int16')
+    clean_df['month'] = clean_df['date'].dt.month.astype('int8')
+
+    return clean_df
+
+def load_data(data_file=DATA_FILE):
+    # SDMX-CSV (e.g. the custom linear export) or a Eurostat bulk .tsv, either one optionally gzipped
+    if not os.path.exists(data_file):
+        raise FileNotFoundError(f"Data file not found: {data_file}")
+
+    return concat_frames([clean_frame(raw_df) for raw_df in read_eurostat(data_file, DIMENSION_COLUMNS)])
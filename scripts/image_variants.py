@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, features
+import argparse
+import glob
+import json
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(script_dir, '..', 'assets', 'images')
+VARIANTS_DIR = os.path.join(IMAGES_DIR, 'responsive')
+MANIFEST_NAME = 'manifest.json'
+
+# Widths offered to srcset; the dashboard column is at most ~1340 CSS px wide
+VARIANT_WIDTHS = [480, 960, 1440, 2048]
+
+def variant_formats():
+    # Most to least preferred, matching the <source> order in the dashboard
+    formats = []
+    if features.check('avif'):
+        formats.append(('avif', {'quality': 60, 'speed': 8}))
+    if features.check('webp'):
+        formats.append(('webp', {'quality': 82, 'method': 6}))
+    formats.append(('png', {'optimize': True}))
+    return formats
+
+def variant_name(stem, width, extension):
+    return f"{stem}-{width}w.{extension}"
+
+def is_fresh(path, source_mtime):
+    return os.path.exists(path) and os.path.getmtime(path) >= source_mtime
+
+def build_variants(source, variants_dir=VARIANTS_DIR, widths=VARIANT_WIDTHS, force=False):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    source_mtime = os.path.getmtime(source)
+    formats = variant_formats()
+
+    with Image.open(source) as image:
+        # Charts are drawn on an opaque background, so the alpha channel is dead weight
+        image = image.convert('RGB')
+        entry = {'width': image.width, 'height': image.height, 'sources': {ext: [] for ext, _ in formats}}
+        written = 0
+        previous = image
+
+        # Largest first, each width resampled from the one above it rather than the full-size render
+        for width in sorted((w for w in widths if w <= image.width), reverse=True):
+            height = round(image.height * width / image.width)
+            resized = None
+
+            for extension, options in formats:
+                name = variant_name(stem, width, extension)
+                path = os.path.join(variants_dir, name)
+                entry['sources'][extension].append({'file': name, 'width': width, 'height': height})
+                if not force and is_fresh(path, source_mtime):
+                    continue
+
+                if resized is None:
+                    resized = previous = previous.resize((width, height), Image.LANCZOS)
+                if extension == 'png':
+                    # 256-colour palette: flat chart colours survive, file size drops several-fold
+                    resized.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(path, **options)
+                else:
+                    resized.save(path, **options)
+                written += 1
+
+    for sources in entry['sources'].values():
+        sources.sort(key=lambda source: source['width'])
+    return stem, entry, written
+
+def build_all(sources, variants_dir=VARIANTS_DIR, workers=None, force=False):
+    # Pillow releases the GIL while encoding, so a thread pool keeps every core busy
+    os.makedirs(variants_dir, exist_ok=True)
+    manifest_path = os.path.join(variants_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        results = list(pool.map(lambda source: build_variants(source, variants_dir, force=force), sources))
+
+    total_written = 0
+    for stem, entry, written in results:
+        manifest[stem] = entry
+        total_written += written
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return total_written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build responsive AVIF/WebP/PNG variants of the chart images.')
+    parser.add_argument('images', nargs='*', help='PNG files (default: every PNG in assets/images)')
+    parser.add_argument('--force', action='store_true', help='re-encode variants even if they are up to date')
+    args = parser.parse_args(argv)
+
+    sources = args.images or sorted(glob.glob(os.path.join(IMAGES_DIR, '*.png')))
+    written = build_all(sources, force=args.force)
+    print(f"Wrote {written} image variant(s) for {len(sources)} chart(s) to {os.path.relpath(VARIANTS_DIR)}")
+
+if __name__ == "__main__":
+    main()
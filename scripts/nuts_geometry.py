@@ -0,0 +1,210 @@
+from data_cache import CACHE_DIR, hash_file
+import numpy as np
+import json
+import os
+
+GEOMETRY_CACHE_DIR = os.path.join(CACHE_DIR, 'geometry')
+
+# Bump whenever simplification or the cached feature layout changes
+GEOMETRY_VERSION = 2
+
+# Coordinates are rounded to this many decimal degrees (~10 m), well below any useful tolerance
+COORD_DECIMALS = 4
+
+def simplify_line(points, tolerance):
+    # Douglas-Peucker on an (n, 2) array: keep the point farthest from each chord while it
+    # is more than tolerance away, then recurse into both halves (with an explicit stack)
+    n_points = len(points)
+    if n_points < 3 or tolerance <= 0:
+        return points
+
+    keep = np.zeros(n_points, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n_points - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        chord = end - start
+        length = np.hypot(*chord)
+        if length == 0:
+            # Closed ring: measure from the shared start/end point instead of a chord
+            distances = np.hypot(*(inner - start).T)
+        else:
+            distances = np.abs(chord[0] * (inner[:, 1] - start[1]) - chord[1] * (inner[:, 0] - start[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return points[keep]
+
+def prepare_ring(ring):
+    # Rounded (n, 2) points of a ring, without repeated vertices or the closing point
+    points = np.round(np.asarray(ring, dtype=float)[:, :2], COORD_DECIMALS)
+    points = points[np.r_[True, (points[1:] != points[:-1]).any(axis=1)]]
+    if len(points) > 1 and (points[0] == points[-1]).all():
+        points = points[:-1]
+    return points
+
+def find_junctions(rings):
+    # Vertex ids of every ring, and which ids are junctions: vertices seen with more than one
+    # pair of neighbours, where borders meet or part. Between two junctions a border is the
+    # same run of vertices on both sides
+    grid = np.round(np.concatenate(rings) * 10 ** COORD_DECIMALS).astype(np.int64)
+    grid -= grid.min(axis=0)
+    _, ids = np.unique(grid[:, 0] * (grid[:, 1].max() + 1) + grid[:, 1], return_inverse=True)
+    ring_ids = np.split(ids, np.cumsum([len(points) for points in rings])[:-1])
+    before = np.concatenate([np.roll(vertices, 1) for vertices in ring_ids])
+    after = np.concatenate([np.roll(vertices, -1) for vertices in ring_ids])
+    low, high = np.minimum(before, after), np.maximum(before, after)
+
+    # Compare every occurrence with the first one of its vertex
+    first_low = np.empty(ids.max() + 1, dtype=np.int64)
+    first_high = np.empty(ids.max() + 1, dtype=np.int64)
+    first_low[ids[::-1]] = low[::-1]
+    first_high[ids[::-1]] = high[::-1]
+    junction = np.zeros(ids.max() + 1, dtype=bool)
+    junction[ids[(low != first_low[ids]) | (high != first_high[ids])]] = True
+    return ring_ids, junction
+
+def ring_arcs(ids, junction):
+    # Positions of a ring's arcs, each running from one junction to the next inclusive. A ring
+    # without junctions is one closed arc from its lowest vertex id, so both copies of a
+    # shared ring (an enclave and the hole around it) start at the same vertex
+    stops = np.flatnonzero(junction[ids])
+    start = stops[0] if len(stops) else int(np.argmin(ids))
+    order = (np.arange(len(ids) + 1) + start) % len(ids)
+    cuts = np.flatnonzero(junction[ids[order]]) if len(stops) else [0, len(ids)]
+    return [order[first:last + 1] for first, last in zip(cuts[:-1], cuts[1:])]
+
+def simplify_rings(rings, tolerance):
+    # Simplifies all rings together, TopoJSON-style: every arc is simplified once and shared
+    # by the rings on both sides of it, so neighbouring regions keep meeting without slivers
+    # or gaps. Junctions always stay, as the ends of their arcs
+    if not rings:
+        return []
+    ring_ids, junction = find_junctions(rings)
+    arcs = {}
+    simplified = []
+    for points, ids in zip(rings, ring_ids):
+        parts = []
+        for positions in ring_arcs(ids, junction):
+            key = tuple(ids[positions].tolist())
+            if key in arcs:
+                arc = arcs[key]
+            elif key[::-1] in arcs:
+                arc = arcs[key[::-1]][::-1]
+            else:
+                arc = arcs[key] = simplify_line(points[positions], tolerance)
+            parts.append(arc if not parts else arc[1:])
+        simplified.append(np.concatenate(parts))
+    return simplified
+
+def polygon_coordinates(rings, simplified):
+    # rings[0] is the outline, the rest are holes. Holes that collapse below a triangle are
+    # dropped; a collapsing outline keeps its original points so no region disappears
+    coordinates = []
+    for position, (points, reduced) in enumerate(zip(rings, simplified)):
+        if len(reduced) < 4:
+            if position > 0:
+                continue
+            reduced = np.vstack([points, points[:1]])
+        coordinates.append(reduced.tolist())
+    return coordinates
+
+def simplify_geometries(geometries, tolerance):
+    # (Multi)Polygons of all regions simplified as one topology; other geometry types pass through
+    polygons = [[geometry['coordinates']] if geometry['type'] == 'Polygon'
+                else geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else []
+                for geometry in geometries]
+    polygons = [[[prepare_ring(ring) for ring in polygon] for polygon in shape] for shape in polygons]
+    simplified = iter(simplify_rings([ring for shape in polygons for polygon in shape for ring in polygon], tolerance))
+
+    result = []
+    for geometry, shape in zip(geometries, polygons):
+        coordinates = [polygon_coordinates(polygon, [next(simplified) for _ in polygon]) for polygon in shape]
+        if geometry['type'] == 'Polygon':
+            geometry = {'type': 'Polygon', 'coordinates': coordinates[0]}
+        elif geometry['type'] == 'MultiPolygon':
+            geometry = {'type': 'MultiPolygon', 'coordinates': coordinates}
+        result.append(geometry)
+    return result
+
+def feature_id(feature):
+    # Eurostat/GISCO NUTS files carry the code as NUTS_ID; other exports as the feature id
+    properties = feature.get('properties') or {}
+    return str(feature.get('id') or properties.get('NUTS_ID') or properties.get('id'))
+
+def feature_name(feature):
+    properties = feature.get('properties') or {}
+    return properties.get('NAME_LATN') or properties.get('NUTS_NAME') or properties.get('name') or feature_id(feature)
+
+def geometry_cache_name(content_hash, level, tolerance):
+    level_part = 'all' if level is None else level
+    return f"nuts_v{GEOMETRY_VERSION}_{content_hash}_l{level_part}_t{tolerance:g}.geojson"
+
+def load_regions(geojson_file, level=None, tolerance=0.01, cache_dir=GEOMETRY_CACHE_DIR):
+    # Simplified FeatureCollection of one NUTS level with features keyed by code in 'id'.
+    # Simplifying a full-resolution NUTS file takes seconds, so the result is cached per
+    # (file content, level, tolerance)
+    if not os.path.exists(geojson_file):
+        raise FileNotFoundError(f"GeoJSON file not found: {geojson_file}")
+
+    cache_path = os.path.join(cache_dir, geometry_cache_name(hash_file(geojson_file), level, tolerance))
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable geometry cache {os.path.basename(cache_path)}: {e}")
+
+    with open(geojson_file) as f:
+        source = json.load(f)
+
+    selected = []
+    for feature in source.get('features', []):
+        properties = feature.get('properties') or {}
+        if level is not None and 'LEVL_CODE' in properties and int(properties['LEVL_CODE']) != level:
+            continue
+        if not feature.get('geometry'):
+            continue
+        selected.append(feature)
+    # The level's regions are simplified together, so the borders they share stay shared
+    geometries = simplify_geometries([feature['geometry'] for feature in selected], tolerance)
+    features = [{
+        'type': 'Feature',
+        'id': feature_id(feature),
+        'properties': {'name': feature_name(feature)},
+        'geometry': geometry,
+    } for feature, geometry in zip(selected, geometries)]
+    regions = {'type': 'FeatureCollection', 'features': features}
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(regions, f, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+    return regions
+
+def region_index(regions):
+    # Region code -> position of its feature
+    return {feature['id']: position for position, feature in enumerate(regions['features'])}
+
+def region_names(regions):
+    return {feature['id']: feature['properties']['name'] for feature in regions['features']}
+
+def write_regions(regions, path):
+    # Geometry file the dashboard's map specs point at; rewritten only when it changed
+    payload = json.dumps(regions, separators=(',', ':')).encode()
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return True
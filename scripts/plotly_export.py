@@ -0,0 +1,116 @@
+from multiprocessing import util
+from run_metrics import metrics
+import time
+import os
+
+class ImageExporter:
+    # Queues plotly PNG exports and renders them through one Kaleido session that stays
+    # warm for the life of the process, instead of paying the Chromium start-up per image.
+
+    def __init__(self):
+        self.pending = []
+        self.timings = []
+        self.session = None
+
+    def submit(self, fig, path, **options):
+        # Snapshot the figure now: charts keep restyling it for the HTML version afterwards
+        self.pending.append((fig.to_dict(), path, options))
+
+    def start(self):
+        if self.session is not None:
+            return self.session
+
+        try:
+            import kaleido
+        except ImportError:
+            self.session = 'unavailable'
+            return self.session
+
+        if not hasattr(kaleido, 'start_sync_server'):
+            # Kaleido < 1.0 keeps its own persistent subprocess once the first image is made
+            self.session = 'legacy'
+            return self.session
+
+        try:
+            # Probe with a one-shot render first: a sync server whose Chromium fails to launch
+            # dies in its thread and leaves every later export blocked forever
+            import plotly.graph_objects as go
+            import plotly.io as pio
+            pio.to_image(go.Figure(), format='png', width=16, height=16)
+            kaleido.start_sync_server(silence_warnings=True)
+        except Exception as e:
+            print(f"Kaleido could not start ({type(e).__name__}: {e}); PNG map exports will be skipped")
+            self.session = 'unavailable'
+            return self.session
+
+        self.session = 'server'
+        # Runs from multiprocessing's exit hook, so pool workers shut their Chromium down too
+        util.Finalize(None, self.stop, exitpriority=10)
+        return self.session
+
+    def stop(self):
+        if self.session == 'server':
+            import kaleido
+            kaleido.stop_sync_server(silence_warnings=True)
+        self.session = None
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        if not pending:
+            return []
+
+        import plotly.io as pio
+
+        session = self.start()
+        timings = []
+        for figure, path, options in pending:
+            name = os.path.basename(path)
+            if session == 'unavailable':
+                print(f"  skipped {name}: Kaleido is not available, existing file left in place")
+                timings.append({'output': name, 'seconds': 0.0, 'status': 'skipped'})
+                continue
+
+            start = time.perf_counter()
+            with metrics.stage('write_image', path):
+                pio.write_image(figure, path, **options)
+            seconds = time.perf_counter() - start
+            print(f"  exported {name} in {seconds:.2f}s")
+            timings.append({'output': name, 'seconds': seconds, 'status': 'ok'})
+
+        self.timings.extend(timings)
+        return timings
+
+exporter = ImageExporter()
+
+def export_image(fig, path, **options):
+    exporter.submit(fig, path, **options)
+
+def flush_exports():
+    return exporter.flush()
+
+def write_figure_spec(fig, path):
+    # Bare JSON figure spec (a few KB) for pages that already load plotly.js once;
+    # the base map itself is fetched by plotly.js per geo scope, so only Europe's is loaded
+    fig.write_json(path, pretty=False, remove_uids=True)
+
+def write_shared_plotlyjs(path):
+    # One plotly.js bundle, matching the plotly.py that wrote the specs, shared by every map
+    from plotly.offline import get_plotlyjs
+    bundle = get_plotlyjs().encode()
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == bundle:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(bundle)
+    return True
+
+def write_map(fig, stem, formats):
+    # formats: 'json' for the dashboard spec, 'html' for a standalone page with plotly.js inlined
+    if 'json' in formats:
+        with metrics.stage('write_json', stem + '.json'):
+            write_figure_spec(fig, stem + '.json')
+    if 'html' in formats:
+        with metrics.stage('write_html', stem + '.html'):
+            fig.write_html(stem + '.html')
@@ -2,11 +2,36 @@
 
 import pandas as pd
 import numpy as np
+import matplotlib
+import os
+
+# Batch runs render off-screen; --preview switches to an interactive backend in main()
+if not os.environ.get('MPLBACKEND'):
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
+import functools
+import argparse
+import time
 import warnings
-import os
+import sys
+from data_cache import hash_file, load_cached, prune_cache, select_rows
+from eurostat_reader import DATA_FILE, DIMENSION_COLUMNS, clean_frame, concat_frames, load_data, read_eurostat
+from tourism_dataset import TourismDataset
+from tourism_cube import AggregateCube
+from render_jobs import resolve_workers, run_jobs
+from plotly_export import export_image, flush_exports, exporter, write_map, write_shared_plotlyjs
+from build_manifest import load_manifest, save_manifest, plan_rebuild, record_results
+from image_variants import build_all as build_image_variants
+from choropleth import build_map_frame
+from nuts_geometry import load_regions, region_index, region_names, write_regions
+from chart_registry import CHARTS, chart, select_charts, merge_data
+from run_metrics import metrics
+from dashboard_data import DATA_API_VERSION, column, dataset_file, periods, write_datasets
+from delta_ingest import (affected_charts, apply_delta, changed_partitions, delta_summary, describe_partitions,
+                          diff_frames, load_store, save_store)
 warnings.filterwarnings('ignore')
 
 # Create output directory for images
@@ -14,6 +39,12 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(script_dir, '..', 'assets', 'images')
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Shared plotly.js bundle the dashboard loads once for every JSON map spec
+PLOTLYJS_FILE = os.path.join(script_dir, '..', 'assets', 'js', 'plotly.min.js')
+
+# Simplified region geometry for the NUTS map, referenced by its spec instead of inlined
+GEOMETRY_DIR = os.path.join(script_dir, '..', 'assets', 'geo')
+
 plt.style.use('default')
 
 PROFESSIONAL_COLORS = {
@@ -38,59 +69,153 @@ PROFESSIONAL_COLORS = {
     'text_secondary': '#2C3E50'     # Secondary text
 }
 
-plt.rcParams['figure.figsize'] = (16, 12)
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Helvetica', 'Arial', 'DejaVu Sans']
-plt.rcParams['font.size'] = 14
-plt.rcParams['axes.titlesize'] = 22
-plt.rcParams['axes.labelsize'] = 16
-plt.rcParams['xtick.labelsize'] = 14
-plt.rcParams['ytick.labelsize'] = 14
-plt.rcParams['legend.fontsize'] = 14
-plt.rcParams['figure.titlesize'] = 24
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['grid.linewidth'] = 1.0
-plt.rcParams['lines.linewidth'] = 3.0
+RC_PARAMS = {
+    'figure.figsize': (16, 12),
+    'font.family': 'sans-serif',
+    'font.sans-serif': ['Helvetica', 'Arial', 'DejaVu Sans'],
+    'font.size': 14,
+    'axes.titlesize': 22,
+    'axes.labelsize': 16,
+    'xtick.labelsize': 14,
+    'ytick.labelsize': 14,
+    'legend.fontsize': 14,
+    'figure.titlesize': 24,
+    'axes.linewidth': 1.5,
+    'grid.linewidth': 1.0,
+    'lines.linewidth': 3.0,
+}
+plt.rcParams.update(RC_PARAMS)
 
-def load_data():
-    # Get the directory of this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level to project root, then into data directory
-    data_file = os.path.join(script_dir, '..', 'data', 'tour_occ_nim__custom_19389427_linear_2_0.csv')
-    
+# Interactive backends tried in order by --preview
+PREVIEW_BACKENDS = ['macosx', 'QtAgg', 'GTK4Agg', 'GTK3Agg', 'TkAgg', 'WXAgg']
+PREVIEW = False
+
+# Interactive map outputs: 'json' specs for the dashboard and/or standalone 'html' pages
+MAP_FORMATS = ['json']
+
+# Region map settings from --nuts-geojson: {'level', 'tolerance', 'regions', 'source_hash'}; None disables it
+NUTS_MAP = None
+
+# Hover classes of the two choropleths (see choropleth.py for the format)
+IMPACT_CLASSES = {
+    'edges': [-60, -50, -40, -30],
+    'right': True,
+    'labels': {
+        'severity': ['DEVASTATING', 'SEVERE', 'SIGNIFICANT', 'MODERATE', 'LIMITED'],
+        'context': ['Tourism industry collapsed', 'Major economic disruption', 'Substantial losses',
+                    'Notable decline', 'Relatively resilient'],
+    },
+}
+RECOVERY_CLASSES = {
+    'edges': [-10, 0, 10, 20],
+    'right': False,
+    'labels': {
+        'performance': ['LAGGING', 'STRUGGLING', 'RECOVERED', 'STRONG', 'EXCEPTIONAL'],
+        'context': ['Significant recovery challenges', 'Still below pre-pandemic levels',
+                    'Back to pre-pandemic levels', 'Solid growth above 2019 levels',
+                    'Tourism boom - far above pre-pandemic'],
+        'color_category': ['lagging', 'struggling', 'recovered', 'strong', 'exceptional'],
+    },
+}
+
+# Everything besides a chart's own code that changes how it renders
+RENDER_STYLE = {'colors': PROFESSIONAL_COLORS, 'rcParams': RC_PARAMS,
+                'map_classes': {'impact': IMPACT_CLASSES, 'recovery': RECOVERY_CLASSES}}
+
+EU27_GEOS = ['AT', 'BE', 'BG', 'CY', 'CZ', 'DE', 'DK', 'EE', 'EL', 'ES', 'FI', 'FR', 'HR', 'HU',
+             'IE', 'IT', 'LT', 'LU', 'LV', 'MT', 'NL', 'PL', 'PT', 'RO', 'SE', 'SI', 'SK']
+
+# Recovery is the % change vs the same month of 2019, derived locally from the nights
+# (tourism_indicators.py), so the PCH_SM_19 unit is never read
+RECOVERY_MEASURE = 'pct_vs_2019'
+
+# Dimension values each chart reads (see chart_registry.py); only the union of the selected
+# charts' slices is loaded, and --stream drops every other row while reading
+NIGHTS_BY_COUNTRY = {'unit': ['NR'], 'nace_r2': ['I551-I553'], 'c_resid': ['TOTAL'], 'geo': EU27_GEOS}
+NIGHTS_EU = {'unit': ['NR'], 'nace_r2': ['I551-I553'], 'c_resid': ['TOTAL'], 'geo': ['EU27_2020']}
+RECOVERY_BY_COUNTRY = {'unit': ['NR'], 'nace_r2': ['I551-I553'], 'c_resid': ['TOTAL'], 'geo': EU27_GEOS}
+RECOVERY_BY_REGION = {'unit': ['NR'], 'nace_r2': ['I551-I553'], 'c_resid': ['TOTAL']}
+RECOVERY_BY_SECTOR = {'unit': ['NR'], 'nace_r2': ['I551', 'I552', 'I553'], 'c_resid': ['TOTAL']}
+RECOVERY_EU = {'unit': ['NR'], 'nace_r2': ['I551-I553'], 'c_resid': ['TOTAL'], 'geo': ['EU27_2020']}
+RESIDENCE_EU = {'unit': ['NR'], 'nace_r2': ['I551-I553'], 'c_resid': ['DOM', 'FOR'], 'geo': ['EU27_2020']}
+COUNTRY_CHARTS_DATA = {'unit': ['NR'], 'nace_r2': ['I551-I553'], 'c_resid': ['TOTAL', 'DOM', 'FOR'],
+                       'geo': EU27_GEOS}
+DATA_API_DATA = merge_data([NIGHTS_BY_COUNTRY, NIGHTS_EU, RECOVERY_BY_COUNTRY, RECOVERY_BY_SECTOR, RECOVERY_EU,
+                            RESIDENCE_EU])
+
+# Datasets of the dashboard data API, written under assets/data/v{DATA_API_VERSION}/
+DATA_API_DATASETS = ['country_change', 'recovery_2024', 'trajectory', 'sectors', 'monthly', 'residence']
+
+# Helpers each chart draws with (see chart_registry.py); editing one re-renders the charts listing it
+FIGURE_HELPERS = ['save_png', 'finish_figure']
+MAP_HELPERS = ['choropleth', 'plotly_export']
+PROJECTION_HELPERS = ['series_projection', 'tourism_forecast']
+
+STREAM_CHUNK_ROWS = 500_000
+
+COUNTRY_NAMES = {
+    'AT': 'Austria', 'BE': 'Belgium', 'BG': 'Bulgaria', 'CY': 'Cyprus', 'CZ': 'Czechia', 'DE': 'Germany',
+    'DK': 'Denmark', 'EE': 'Estonia', 'EL': 'Greece', 'ES': 'Spain', 'FI': 'Finland', 'FR': 'France',
+    'HR': 'Croatia', 'HU': 'Hungary', 'IE': 'Ireland', 'IT': 'Italy', 'LT': 'Lithuania', 'LU': 'Luxembourg',
+    'LV': 'Latvia', 'MT': 'Malta', 'NL': 'Netherlands', 'PL': 'Poland', 'PT': 'Portugal', 'RO': 'Romania',
+    'SE': 'Sweden', 'SI': 'Slovenia', 'SK': 'Slovakia'
+}
+
+def stream_data(data_file=DATA_FILE, keep=None, chunksize=STREAM_CHUNK_ROWS):
+    # For extracts too large to load whole: read fixed-size chunks and keep only the
+    # dimension values in keep, so memory holds one raw chunk plus the rows the charts use
     if not os.path.exists(data_file):
         raise FileNotFoundError(f"Data file not found: {data_file}")
     
-    df = pd.read_csv(data_file)
-    
-    clean_df = df.iloc[:, [5, 7, 9, 11, 13, 15]].copy()
-    clean_df.columns = ['c_resid', 'unit', 'nace_r2', 'geo', 'time_period', 'obs_value']
-    
-    clean_df = clean_df.dropna(subset=['time_period', 'obs_value'])
-    clean_df['obs_value'] = pd.to_numeric(clean_df['obs_value'], errors='coerce')
-    clean_df['date'] = pd.to_datetime(clean_df['time_period'], format='%Y-%m', errors='coerce')
-    clean_df = clean_df.dropna(subset=['date', 'obs_value'])
-    clean_df['year'] = clean_df['date'].dt.year
-    clean_df['month'] = clean_df['date'].dt.month
-    
-    return clean_df
+    chunks = [clean_frame(raw_df) for raw_df in read_eurostat(data_file, DIMENSION_COLUMNS, keep, chunksize)]
+    return concat_frames([chunk for chunk in chunks if len(chunk)] or chunks[:1])
+
+def enable_preview(backend=None):
+    global PREVIEW
+    for candidate in [backend] if backend else PREVIEW_BACKENDS:
+        try:
+            plt.switch_backend(candidate)
+        except Exception:
+            continue
+        PREVIEW = True
+        return candidate
+    return None
+
+def save_png(path):
+    with metrics.stage('savefig', path):
+        plt.savefig(path, dpi=300, bbox_inches='tight', 
+                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
+
+def finish_figure(fig):
+    # Every figure is closed once saved, so a batch run holds at most one open figure
+    if PREVIEW:
+        plt.show()
+    plt.close(fig)
+
+def year_month_grid(monthly_totals, years):
+    # (year, month, obs_value) rows -> one row per requested year, columns 1-12; a month
+    # missing from the data is NaN, so its line is drawn with a visible gap
+    grid = monthly_totals.pivot_table(index='year', columns='month', values='obs_value', aggfunc='first')
+    return grid.reindex(index=years, columns=range(1, 13))
 
-def chart1_covid_impact_professional(df):
+@chart('covid-impact', "1. Creating COVID-19 impact analysis (Executive Version)...",
+       ['covid_impact.png'], NIGHTS_BY_COUNTRY, helpers=FIGURE_HELPERS)
+def chart1_covid_impact_professional(cube):
     
     # EU countries (consistent with official EU statistics)
     eu27_countries = ['ES', 'IT', 'FR', 'DE', 'NL', 'PT', 'EL', 'HR', 'CY', 'MT',
                      'PL', 'CZ', 'HU', 'DK', 'SE', 'AT', 'BE', 'RO', 'BG', 'SK', 
                      'SI', 'FI', 'IE', 'LU', 'EE', 'LV', 'LT']
     
-    impact_data = df[
-        (df['geo'].isin(eu27_countries)) &
-        (df['unit'] == 'NR') &
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'].isin([2019, 2020]))
-    ]
+    annual_totals = cube.rollup(
+        'obs_value', 'sum', ['geo', 'year'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=eu27_countries,
+        years=[2019, 2020]
+    ).reset_index()
     
-    annual_totals = impact_data.groupby(['geo', 'year'])['obs_value'].sum().reset_index()
     pivot_data = annual_totals.pivot(index='geo', columns='year', values='obs_value')
     
     if 2019 in pivot_data.columns and 2020 in pivot_data.columns:
@@ -150,12 +275,13 @@ def chart1_covid_impact_professional(df):
         ax.tick_params(axis='x', length=8, width=1.5, color=PROFESSIONAL_COLORS['silver'])
         ax.tick_params(axis='y', length=0)
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, 'covid_impact.png'), dpi=300, bbox_inches='tight', 
-                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
-        plt.show()
+        fig.tight_layout()
+        save_png(os.path.join(OUTPUT_DIR, 'covid_impact.png'))
+        finish_figure(fig)
 
-def chart1_covid_impact_map(df):
+@chart('covid-map', "1b. Creating COVID-19 impact map (EU Countries)...",
+       ['covid_impact_map_journalism.png', 'covid_impact_map.{map}'], NIGHTS_BY_COUNTRY, helpers=MAP_HELPERS)
+def chart1_covid_impact_map(cube):
     import plotly.express as px
     import plotly.graph_objects as go
     
@@ -164,16 +290,16 @@ def chart1_covid_impact_map(df):
                      'PL', 'CZ', 'HU', 'DK', 'SE', 'AT', 'BE', 'RO', 'BG', 'SK', 
                      'SI', 'FI', 'IE', 'LU', 'EE', 'LV', 'LT']
     
-    impact_data = df[
-        (df['geo'].isin(eu27_countries)) &
-        (df['unit'] == 'NR') &
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'].isin([2019, 2020]))
-    ]
+    annual_totals = cube.rollup(
+        'obs_value', 'sum', ['geo', 'year'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=eu27_countries,
+        years=[2019, 2020]
+    ).reset_index()
     
-    if not impact_data.empty:
-        annual_totals = impact_data.groupby(['geo', 'year'])['obs_value'].sum().reset_index()
+    if not annual_totals.empty:
         pivot_data = annual_totals.pivot(index='geo', columns='year', values='obs_value')
         
         if 2019 in pivot_data.columns and 2020 in pivot_data.columns:
@@ -198,38 +324,8 @@ def chart1_covid_impact_map(df):
                 'LV': 'Latvia', 'LT': 'Lithuania'
             }
             
-            map_data = []
-            for geo_code in pivot_data.index:
-                if geo_code in country_mapping:
-                    impact_val = pivot_data.loc[geo_code, 'pct_change']
-                    
-                    # Add journalism context for hover
-                    if impact_val <= -60:
-                        severity = "DEVASTATING"
-                        context = "Tourism industry collapsed"
-                    elif impact_val <= -50:
-                        severity = "SEVERE"
-                        context = "Major economic disruption"
-                    elif impact_val <= -40:
-                        severity = "SIGNIFICANT"
-                        context = "Substantial losses"
-                    elif impact_val <= -30:
-                        severity = "MODERATE"
-                        context = "Notable decline"
-                    else:
-                        severity = "LIMITED"
-                        context = "Relatively resilient"
-                    
-                    map_data.append({
-                        'iso_alpha': country_mapping[geo_code],
-                        'country': country_names.get(geo_code, geo_code),
-                        'impact': impact_val,
-                        'severity': severity,
-                        'context': context,
-                        'impact_display': f"{impact_val:.1f}%"
-                    })
-            
-            map_df = pd.DataFrame(map_data)
+            map_df = build_map_frame(pivot_data['pct_change'], 'impact', IMPACT_CLASSES,
+                                     country_mapping, country_names, '{:.1f}%')
             
             # Find key countries for annotations
             worst_hit = map_df.loc[map_df['impact'].idxmin()]
@@ -321,9 +417,9 @@ def chart1_covid_impact_map(df):
                 }
             )
             
-            fig.write_image(os.path.join(OUTPUT_DIR, 'covid_impact_map_journalism.png'), width=1800, height=1400, scale=2)
+            export_image(fig, os.path.join(OUTPUT_DIR, 'covid_impact_map_journalism.png'), width=1800, height=1400, scale=2)
             
-            # Also save as HTML with responsive sizing
+            # Also save the interactive version with responsive sizing
             fig.update_layout(
                 width=None,  # Remove fixed width
                 height=None,  # Remove fixed height
@@ -344,9 +440,11 @@ def chart1_covid_impact_map(df):
                 }
             )
             
-            fig.write_html(os.path.join(OUTPUT_DIR, 'covid_impact_map.html'))
+            write_map(fig, os.path.join(OUTPUT_DIR, 'covid_impact_map'), MAP_FORMATS)
             
-def chart2_recovery_map_journalism(df):
+@chart('recovery-map', "2a. Creating 2024 recovery map (EU Countries)...",
+       ['recovery_2024_map_journalism.png', 'recovery_2024_map.{map}'], RECOVERY_BY_COUNTRY, helpers=MAP_HELPERS)
+def chart2_recovery_map_journalism(cube):
     import plotly.express as px
     import plotly.graph_objects as go
     
@@ -355,16 +453,16 @@ def chart2_recovery_map_journalism(df):
                      'PL', 'CZ', 'HU', 'DK', 'SE', 'AT', 'BE', 'RO', 'BG', 'SK', 
                      'SI', 'FI', 'IE', 'LU', 'EE', 'LV', 'LT']
     
-    recovery_data = df[
-        (df['geo'].isin(eu27_countries)) &
-        (df['unit'] == 'PCH_SM_19') & 
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'] == 2024)
-    ]
+    country_recovery = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['geo'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=eu27_countries,
+        years=2024
+    ).reset_index()
     
-    if not recovery_data.empty:
-        country_recovery = recovery_data.groupby('geo')['obs_value'].mean().reset_index()
+    if not country_recovery.empty:
         country_recovery = country_recovery.dropna()
         
         if not country_recovery.empty:
@@ -386,45 +484,8 @@ def chart2_recovery_map_journalism(df):
                 'LV': 'Latvia', 'LT': 'Lithuania'
             }
             
-            map_data = []
-            for _, row in country_recovery.iterrows():
-                geo_code = row['geo']
-                if geo_code in country_mapping:
-                    recovery_val = row['obs_value']
-                    
-                    # Add journalism context for recovery performance
-                    if recovery_val >= 20:
-                        performance = "EXCEPTIONAL"
-                        context = "Tourism boom - far above pre-pandemic"
-                        color_category = "exceptional"
-                    elif recovery_val >= 10:
-                        performance = "STRONG"
-                        context = "Solid growth above 2019 levels"
-                        color_category = "strong"
-                    elif recovery_val >= 0:
-                        performance = "RECOVERED"
-                        context = "Back to pre-pandemic levels"
-                        color_category = "recovered"
-                    elif recovery_val >= -10:
-                        performance = "STRUGGLING"
-                        context = "Still below pre-pandemic levels"
-                        color_category = "struggling"
-                    else:
-                        performance = "LAGGING"
-                        context = "Significant recovery challenges"
-                        color_category = "lagging"
-                    
-                    map_data.append({
-                        'iso_alpha': country_mapping[geo_code],
-                        'country': country_names.get(geo_code, geo_code),
-                        'recovery': recovery_val,
-                        'performance': performance,
-                        'context': context,
-                        'recovery_display': f"{recovery_val:+.1f}%",
-                        'color_category': color_category
-                    })
-            
-            map_df = pd.DataFrame(map_data)
+            map_df = build_map_frame(country_recovery.set_index('geo')[RECOVERY_MEASURE], 'recovery', RECOVERY_CLASSES,
+                                     country_mapping, country_names, '{:+.1f}%')
             
             if not map_df.empty:
                 best_performer = map_df.loc[map_df['recovery'].idxmax()]
@@ -524,9 +585,9 @@ def chart2_recovery_map_journalism(df):
                     }
                 )
                 
-                fig.write_image(os.path.join(OUTPUT_DIR, 'recovery_2024_map_journalism.png'), width=1800, height=1400, scale=2)
+                export_image(fig, os.path.join(OUTPUT_DIR, 'recovery_2024_map_journalism.png'), width=1800, height=1400, scale=2)
                 
-                # Also save as HTML with responsive sizing
+                # Also save the interactive version with responsive sizing
                 fig.update_layout(
                     width=None,  # Remove fixed width
                     height=None,  # Remove fixed height
@@ -547,67 +608,196 @@ def chart2_recovery_map_journalism(df):
                     }
                 )
                 
-                fig.write_html(os.path.join(OUTPUT_DIR, 'recovery_2024_map.html'))
+                write_map(fig, os.path.join(OUTPUT_DIR, 'recovery_2024_map'), MAP_FORMATS)
                 
-def chart2_recovery_trajectory_professional(df):
+def nuts_geometry_file(level):
+    return os.path.join(GEOMETRY_DIR, f'nuts{level}.geojson')
+
+@chart('nuts-map', "2b. Creating regional recovery map (NUTS)...",
+       ['recovery_nuts{level}_map_journalism.png', 'recovery_nuts{level}_map.{map}'], RECOVERY_BY_REGION,
+       needs='nuts_geojson', helpers=MAP_HELPERS + ['nuts_geometry'])
+def chart_nuts_recovery_map(cube):
+    import plotly.express as px
+    
+    level, regions = NUTS_MAP['level'], NUTS_MAP['regions']
+    index = region_index(regions)
+    region_codes = [geo for geo in cube.dataset.values('geo') if geo in index]
+    if not region_codes:
+        print(f"  no NUTS {level} regions of the GeoJSON appear in the data; skipping the region map")
+        return
+    
+    region_recovery = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['geo'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=region_codes,
+        years=2024
+    ).dropna()
+    
+    if region_recovery.empty:
+        return
+    
+    map_df = build_map_frame(region_recovery, 'recovery', RECOVERY_CLASSES, {code: code for code in index},
+                             region_names(regions), '{:+.1f}%', location_column='nuts_id')
+    map_df['recovery_capped'] = map_df['recovery'].clip(lower=-15, upper=15)
+    
+    fig = px.choropleth(
+        map_df,
+        geojson=regions,
+        featureidkey='id',
+        locations='nuts_id',
+        color='recovery_capped',
+        hover_name='country',
+        hover_data={
+            'recovery_display': True,
+            'performance': True,
+            'context': True,
+            'nuts_id': True,
+            'recovery': False,
+            'recovery_capped': False
+        },
+        color_continuous_scale=[
+            [0.0, '#D32F2F'],
+            [0.2, '#FFCDD2'],
+            [0.4, '#FFEBEE'],
+            [0.5, '#F5F5F5'],
+            [0.6, '#E8F5E8'],
+            [0.8, '#C8E6C9'],
+            [1.0, '#4CAF50']
+        ],
+        range_color=[-15, 15],
+        labels={
+            'recovery_capped': '2024 Performance vs 2019 (%)',
+            'recovery_display': 'Performance',
+            'performance': 'Recovery Level',
+            'context': 'Tourism Status',
+            'nuts_id': 'NUTS code'
+        }
+    )
+    # Hairline borders: at 1,000+ regions the default outline swamps the fill colours
+    fig.update_traces(marker_line_width=0.3, marker_line_color='#FFFFFF')
+    
+    fig.update_geos(
+        visible=False,
+        showocean=True, oceancolor="#E6F3FF",
+        showland=True, landcolor="#F5F5F5",
+        fitbounds="locations",
+        projection_type="mercator"
+    )
+    
+    fig.update_layout(
+        title={
+            'text': f'<b>EU TOURISM RECOVERY BY REGION</b><br><span style="font-size:18px">NUTS {level} regions, 2024 vs 2019</span>',
+            'x': 0.5,
+            'xanchor': 'center',
+            'y': 0.95,
+            'font': {'size': 28, 'color': '#1A1A1A', 'family': 'Arial Black'}
+        },
+        font={'size': 14, 'color': '#2C3E50', 'family': 'Arial'},
+        paper_bgcolor='white',
+        width=1800,
+        height=1400,
+        margin=dict(t=120, b=60, l=40, r=60),
+        coloraxis_colorbar={
+            'title': {'text': '<b>2024 vs 2019 (%)</b>', 'font': {'size': 16, 'family': 'Arial Black'}},
+            'tickvals': [-15, -10, -5, 0, 5, 10, 15],
+            'ticktext': ['-15%', '-10%', '-5%', '0%', '+5%', '+10%', '+15%']
+        }
+    )
+    
+    # The PNG export gets the geometry inline; the spec references the shared geometry file,
+    # relative to itself, so the browser fetches and caches it once
+    export_image(fig, os.path.join(OUTPUT_DIR, f'recovery_nuts{level}_map_journalism.png'), width=1800, height=1400, scale=2)
+    
+    fig.update_layout(width=None, height=None, autosize=True, margin=dict(t=80, b=40, l=20, r=100))
+    fig.update_traces(geojson=os.path.relpath(nuts_geometry_file(level), OUTPUT_DIR).replace(os.sep, '/'))
+    write_map(fig, os.path.join(OUTPUT_DIR, f'recovery_nuts{level}_map'), MAP_FORMATS)
+
+@chart('trajectory', "2. Creating recovery trajectory analysis (Executive Version)...",
+       ['recovery_trajectory.png'], RECOVERY_EU,
+       helpers=FIGURE_HELPERS + PROJECTION_HELPERS + ['draw_recovery_trajectory'])
+def chart2_recovery_trajectory_professional(cube):
     
     # European Union recovery data
-    recovery_data = df[
-        (df['geo'] == 'EU27_2020') &
-        (df['unit'] == 'PCH_SM_19') &
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'].between(2020, 2024))
-    ]
+    monthly_recovery = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['date'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo='EU27_2020',
+        year_range=(2020, 2024)
+    )
+    projection = cube.forecast(2019, nace_r2='I551-I553', c_resid='TOTAL', geo='EU27_2020')
     
-    if not recovery_data.empty:
-        monthly_recovery = recovery_data.groupby('date')['obs_value'].mean()
-        
-        fig, ax = plt.subplots(figsize=(18, 12))
-        fig.patch.set_facecolor(PROFESSIONAL_COLORS['background'])
-        
-        recovery_color = PROFESSIONAL_COLORS['primary_blue']
-        baseline_color = PROFESSIONAL_COLORS['primary_red']
-        
-        ax.plot(monthly_recovery.index, monthly_recovery.values, 
-               color=recovery_color, linewidth=5, marker='o', markersize=10,
-               markerfacecolor='white', markeredgecolor=recovery_color, 
-               markeredgewidth=3, alpha=0.9, zorder=3)
-        
-        ax.axhline(y=0, color=baseline_color, linestyle='--', linewidth=3.5, alpha=0.8,
-                  label='Pre-Pandemic Baseline (2019)', zorder=2)
-        
-        crisis_bg = '#FFD6D6'      # More visible light red tint for crisis
-        recovery_bg = '#D6E8FF'    # More visible light blue tint for recovery
-        
-        ax.axvspan(pd.to_datetime('2020-03'), pd.to_datetime('2021-06'), 
-                  alpha=0.6, color=crisis_bg, label='Crisis Period', zorder=1)
-        ax.axvspan(pd.to_datetime('2023-01'), pd.to_datetime('2024-12'), 
-                  alpha=0.6, color=recovery_bg, label='Full Recovery Period', zorder=1)
-        
-        ax.set_title('European Tourism Recovery Trajectory\nPerformance vs Pre-Pandemic Baseline (2019)', 
-                    fontsize=26, fontweight='bold', pad=35, color=PROFESSIONAL_COLORS['text_primary'])
-        ax.set_xlabel('Year', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
-        ax.set_ylabel('Performance vs 2019 Baseline (%)', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
-        
-        legend = ax.legend(loc='lower right', frameon=True, fancybox=True, 
-                          shadow=True, fontsize=14, framealpha=0.95)
-        legend.get_frame().set_facecolor(PROFESSIONAL_COLORS['background'])
-        legend.get_frame().set_edgecolor(PROFESSIONAL_COLORS['silver'])
-        
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_color(PROFESSIONAL_COLORS['silver'])
-        ax.spines['bottom'].set_color(PROFESSIONAL_COLORS['silver'])
-        ax.spines['left'].set_linewidth(1.5)
-        ax.spines['bottom'].set_linewidth(1.5)
-        
-        ax.grid(True, alpha=0.4, linestyle='-', linewidth=1.0, color=PROFESSIONAL_COLORS['grid'], zorder=0)
-        ax.set_axisbelow(True)
-        
-        ax.tick_params(axis='both', which='major', labelsize=14, colors=PROFESSIONAL_COLORS['text_secondary'])
-        ax.tick_params(axis='both', length=8, width=1.5, color=PROFESSIONAL_COLORS['silver'])
+    if not monthly_recovery.empty:
         
+        draw_recovery_trajectory(monthly_recovery, 'European Tourism Recovery Trajectory',
+                                 os.path.join(OUTPUT_DIR, 'recovery_trajectory.png'), annotate=True,
+                                 projection=series_projection(projection, 'EU27_2020'))
+
+def series_projection(projection, geo, nace_r2='I551-I553', c_resid='TOTAL'):
+    # One series of a cube.forecast() batch, indexed by date; None when it could not be fitted
+    key = (geo, nace_r2, c_resid)
+    if key not in projection.index.droplevel('date'):
+        return None
+    return projection.xs(key, level=['geo', 'nace_r2', 'c_resid'])
+
+def draw_recovery_trajectory(monthly_recovery, heading, path, annotate=False, projection=None):
+    # monthly_recovery: mean % vs 2019 indexed by date; annotate adds the EU storyline callout;
+    # projection: forecast/lower/upper by date, drawn as a dashed line in its band
+    fig, ax = plt.subplots(figsize=(18, 12))
+    fig.patch.set_facecolor(PROFESSIONAL_COLORS['background'])
+    
+    recovery_color = PROFESSIONAL_COLORS['primary_blue']
+    baseline_color = PROFESSIONAL_COLORS['primary_red']
+    
+    ax.plot(monthly_recovery.index, monthly_recovery.values, 
+           color=recovery_color, linewidth=5, marker='o', markersize=10,
+           markerfacecolor='white', markeredgecolor=recovery_color, 
+           markeredgewidth=3, alpha=0.9, zorder=3)
+    
+    if projection is not None and not projection.empty:
+        ax.fill_between(projection.index, projection['lower'], projection['upper'], color=recovery_color,
+                        alpha=0.15, linewidth=0, label='Projection (80% range)', zorder=2)
+        ax.plot(projection.index, projection['forecast'], color=recovery_color, linewidth=3.5,
+                linestyle='--', alpha=0.9, zorder=3)
+    
+    ax.axhline(y=0, color=baseline_color, linestyle='--', linewidth=3.5, alpha=0.8,
+              label='Pre-Pandemic Baseline (2019)', zorder=2)
+    
+    crisis_bg = '#FFD6D6'      # More visible light red tint for crisis
+    recovery_bg = '#D6E8FF'    # More visible light blue tint for recovery
+    
+    ax.axvspan(pd.to_datetime('2020-03'), pd.to_datetime('2021-06'), 
+              alpha=0.6, color=crisis_bg, label='Crisis Period', zorder=1)
+    ax.axvspan(pd.to_datetime('2023-01'), pd.to_datetime('2024-12'), 
+              alpha=0.6, color=recovery_bg, label='Full Recovery Period', zorder=1)
+    
+    ax.set_title(f'{heading}\nPerformance vs Pre-Pandemic Baseline (2019)', 
+                fontsize=26, fontweight='bold', pad=35, color=PROFESSIONAL_COLORS['text_primary'])
+    ax.set_xlabel('Year', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
+    ax.set_ylabel('Performance vs 2019 Baseline (%)', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
+    
+    legend = ax.legend(loc='lower right', frameon=True, fancybox=True, 
+                      shadow=True, fontsize=14, framealpha=0.95)
+    legend.get_frame().set_facecolor(PROFESSIONAL_COLORS['background'])
+    legend.get_frame().set_edgecolor(PROFESSIONAL_COLORS['silver'])
+    
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color(PROFESSIONAL_COLORS['silver'])
+    ax.spines['bottom'].set_color(PROFESSIONAL_COLORS['silver'])
+    ax.spines['left'].set_linewidth(1.5)
+    ax.spines['bottom'].set_linewidth(1.5)
+    
+    ax.grid(True, alpha=0.4, linestyle='-', linewidth=1.0, color=PROFESSIONAL_COLORS['grid'], zorder=0)
+    ax.set_axisbelow(True)
+    
+    ax.tick_params(axis='both', which='major', labelsize=14, colors=PROFESSIONAL_COLORS['text_secondary'])
+    ax.tick_params(axis='both', length=8, width=1.5, color=PROFESSIONAL_COLORS['silver'])
+    
+    if annotate:
         ax.annotate('Full Recovery\nAchieved', 
                    xy=(pd.to_datetime('2023-01'), 0), 
                    xytext=(pd.to_datetime('2021-09'), 15),
@@ -615,29 +805,31 @@ def chart2_recovery_trajectory_professional(df):
                    fontsize=14, ha='center', color='#4A4A4A', fontweight='bold',
                    bbox=dict(boxstyle="round,pad=0.5", facecolor=PROFESSIONAL_COLORS['background'], 
                             edgecolor='#4A4A4A', alpha=0.9, linewidth=2))
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, 'recovery_trajectory.png'), dpi=300, bbox_inches='tight', 
-                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
-        plt.show()
+    
+    fig.tight_layout()
+    save_png(path)
+    finish_figure(fig)
 
-def chart3_country_performance_professional(df):     
+@chart('country-performance', "3. Creating market performance comparison (Executive Version)...",
+       ['3_country_performance.png'], RECOVERY_BY_COUNTRY, helpers=FIGURE_HELPERS)
+def chart3_country_performance_professional(cube):     
     # EU countries (consistent with official EU statistics)
     eu27_countries = ['ES', 'IT', 'FR', 'DE', 'NL', 'PT', 'EL', 'HR', 'CY', 'MT',
                      'PL', 'CZ', 'HU', 'DK', 'SE', 'AT', 'BE', 'RO', 'BG', 'SK', 
                      'SI', 'FI', 'IE', 'LU', 'EE', 'LV', 'LT']
     
     # 2024 performance data
-    performance_data = df[
-        (df['geo'].isin(eu27_countries)) &
-        (df['unit'] == 'PCH_SM_19') &
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'] == 2024)
-    ]
-    
-    if not performance_data.empty:
-        performance = performance_data.groupby('geo')['obs_value'].mean().sort_values(ascending=False)
+    performance = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['geo'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=eu27_countries,
+        years=2024
+    )
+    
+    if not performance.empty:
+        performance = performance.sort_values(ascending=False)
         performance = performance.dropna()
         
         # EU country names
@@ -653,18 +845,15 @@ def chart3_country_performance_professional(df):
         fig, ax = plt.subplots(figsize=(16, 12))
         fig.patch.set_facecolor(PROFESSIONAL_COLORS['background'])
         
-        colors = []
-        for x in performance.values:
-            if x < 0: 
-                colors.append('#C85450')                             # Same light red as COVID chart for negative
-            elif x > 15: 
-                colors.append(PROFESSIONAL_COLORS['primary_green'])     # Exceptional - darkest green
-            elif x > 10: 
-                colors.append(PROFESSIONAL_COLORS['secondary_green'])   # Strong - medium green
-            elif x > 5: 
-                colors.append('#5A9B6A')                             # Good - lighter green
-            else: 
-                colors.append('#7BB88A')                             # Modest - lightest green
+        values = performance.values
+        colors = np.select(
+            [values < 0, values > 15, values > 10, values > 5],
+            ['#C85450',                                 # Same light red as COVID chart for negative
+             PROFESSIONAL_COLORS['primary_green'],      # Exceptional - darkest green
+             PROFESSIONAL_COLORS['secondary_green'],    # Strong - medium green
+             '#5A9B6A'],                                # Good - lighter green
+            default='#7BB88A'                           # Modest - lightest green
+        ).tolist()
         
         bars = ax.barh([country_names.get(geo, geo) for geo in performance.index], 
                       performance.values, color=colors, alpha=0.85, height=0.75,
@@ -717,23 +906,24 @@ def chart3_country_performance_professional(df):
         legend.get_frame().set_facecolor(PROFESSIONAL_COLORS['background'])
         legend.get_frame().set_edgecolor(PROFESSIONAL_COLORS['silver'])
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '3_country_performance.png'), dpi=300, bbox_inches='tight', 
-                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
-        plt.show()
+        fig.tight_layout()
+        save_png(os.path.join(OUTPUT_DIR, '3_country_performance.png'))
+        finish_figure(fig)
 
-def chart4_accommodation_sectors_professional(df):
+@chart('sectors', "4. Creating accommodation sector analysis (Executive Version)...",
+       ['4_accommodation_sectors.png'], RECOVERY_BY_SECTOR, helpers=FIGURE_HELPERS)
+def chart4_accommodation_sectors_professional(cube):
     
     # Accommodation sector data
-    sector_data = df[
-        (df['nace_r2'].isin(['I551', 'I552', 'I553'])) &
-        (df['unit'] == 'PCH_SM_19') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'] == 2024)
-    ]
+    sector_performance = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['nace_r2'],
+        unit='NR',
+        nace_r2=['I551', 'I552', 'I553'],
+        c_resid='TOTAL',
+        years=2024
+    )
     
-    if not sector_data.empty:
-        sector_performance = sector_data.groupby('nace_r2')['obs_value'].mean()
+    if not sector_performance.empty:
         
         sector_names = {
             'I553': 'Camping &\nOutdoor Tourism',
@@ -789,25 +979,25 @@ def chart4_accommodation_sectors_professional(df):
                    bbox=dict(boxstyle="round,pad=0.5", facecolor=PROFESSIONAL_COLORS['background'], 
                             edgecolor='#4A4A4A', alpha=0.9, linewidth=2))
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '4_accommodation_sectors.png'), dpi=300, bbox_inches='tight', 
-                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
-        plt.show()
+        fig.tight_layout()
+        save_png(os.path.join(OUTPUT_DIR, '4_accommodation_sectors.png'))
+        finish_figure(fig)
 
-def chart5_monthly_tourism_journey(df):
+@chart('monthly-journey', "5. Creating monthly tourism journey (2019 vs 2020)...",
+       ['6_monthly_journey.png'], NIGHTS_EU, helpers=FIGURE_HELPERS + ['year_month_grid'])
+def chart5_monthly_tourism_journey(cube):
     
-    # Get monthly data for 2019 and 2020 only
-    monthly_data = df[
-        (df['geo'] == 'EU27_2020') &
-        (df['unit'] == 'NR') &
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'].isin([2019, 2020]))
-    ]
+    # EU monthly totals, shared with the seasonal patterns chart; keep 2019 and 2020 only
+    monthly_totals = cube.rollup(
+        'obs_value', 'sum', ['year', 'month'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo='EU27_2020'
+    ).reset_index()
+    monthly_totals = monthly_totals[monthly_totals['year'].isin([2019, 2020])]
     
-    if not monthly_data.empty:
-        # Group by year and month
-        monthly_totals = monthly_data.groupby(['year', 'month'])['obs_value'].sum().reset_index()
+    if not monthly_totals.empty:
         
         # Create C-suite executive visualization
         fig, ax = plt.subplots(figsize=(16, 10))
@@ -823,27 +1013,15 @@ def chart5_monthly_tourism_journey(df):
             2020: ('#C85450', 's', '2020 (Crisis Year)')
         }
         
-        for year in [2019, 2020]:
-            year_data = monthly_totals[monthly_totals['year'] == year].copy()
-            if not year_data.empty:
-                # Sort by month and ensure we have all 12 months
-                year_data = year_data.sort_values('month')
-                
-                # Get values for each month
-                monthly_values = []
-                month_numbers = []
-                for month in range(1, 13):
-                    month_data = year_data[year_data['month'] == month]
-                    if not month_data.empty:
-                        monthly_values.append(month_data['obs_value'].iloc[0])
-                        month_numbers.append(month)
-                
+        grid = year_month_grid(monthly_totals, [2019, 2020])
+        for year, monthly_values in grid.iterrows():
+            if monthly_values.notna().any():
                 # Plot the line for this year
                 color, marker, label = years_colors[year]
                 linewidth = 6 if year == 2020 else 5  # Emphasize crisis year slightly more
                 markersize = 12 if year == 2020 else 10
                 
-                ax.plot(month_numbers, monthly_values, 
+                ax.plot(grid.columns, monthly_values.values, 
                        color=color, linewidth=linewidth, marker=marker, markersize=markersize,
                        label=label, alpha=0.9, markerfacecolor='white', 
                        markeredgecolor=color, markeredgewidth=3)
@@ -875,14 +1053,9 @@ def chart5_monthly_tourism_journey(df):
         ax.tick_params(axis='both', which='major', labelsize=14, colors=PROFESSIONAL_COLORS['text_secondary'])
         ax.tick_params(axis='both', length=8, width=1.5, color=PROFESSIONAL_COLORS['silver'])
         
-        # Get actual data values for annotations
-        baseline_2019 = monthly_totals[monthly_totals['year'] == 2019].copy()
-        crisis_2020 = monthly_totals[monthly_totals['year'] == 2020].copy()
-        
         # Find August 2019 peak (month 8) for summer annotation
-        aug_2019 = baseline_2019[baseline_2019['month'] == 8]
-        if not aug_2019.empty:
-            aug_value = aug_2019['obs_value'].iloc[0]
+        aug_value = grid.loc[2019, 8]
+        if pd.notna(aug_value):
             ax.annotate('Normal Summer\nPeak Season', 
                        xy=(8, aug_value), 
                        xytext=(10.5, aug_value - 100000000),
@@ -892,9 +1065,8 @@ def chart5_monthly_tourism_journey(df):
                                 edgecolor='#4A4A4A', alpha=0.9, linewidth=2))
         
         # Find March 2020 lockdown impact (month 3) for COVID annotation
-        mar_2020 = crisis_2020[crisis_2020['month'] == 3]
-        if not mar_2020.empty:
-            mar_value = mar_2020['obs_value'].iloc[0]
+        mar_value = grid.loc[2020, 3]
+        if pd.notna(mar_value):
             ax.annotate('COVID-19\nLockdown Impact', 
                        xy=(3, mar_value), 
                        xytext=(1.5, mar_value - 2.5),
@@ -903,84 +1075,91 @@ def chart5_monthly_tourism_journey(df):
                        bbox=dict(boxstyle="round,pad=0.5", facecolor=PROFESSIONAL_COLORS['background'], 
                                 edgecolor='#4A4A4A', alpha=0.9, linewidth=2))
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '6_monthly_journey.png'), dpi=300, bbox_inches='tight', 
-                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
-        plt.show()
+        fig.tight_layout()
+        save_png(os.path.join(OUTPUT_DIR, '6_monthly_journey.png'))
+        finish_figure(fig)
 
-def chart7_domestic_vs_international_recovery(df):
+@chart('residence', "7. Creating domestic vs international recovery comparison...",
+       ['7_domestic_vs_international.png'], RESIDENCE_EU, helpers=FIGURE_HELPERS + ['draw_domestic_vs_international'])
+def chart7_domestic_vs_international_recovery(cube):
     
     # Get EU domestic and international recovery data
-    recovery_data = df[
-        (df['geo'] == 'EU27_2020') &
-        (df['unit'] == 'PCH_SM_19') &
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'].isin(['DOM', 'FOR'])) &
-        (df['year'].between(2020, 2024))
-    ]
-    
-    if not recovery_data.empty:
-        # Group by year, month, and residence type
-        monthly_recovery = recovery_data.groupby(['date', 'c_resid'])['obs_value'].mean().reset_index()
-        
-        # Create executive visualization
-        fig, ax = plt.subplots(figsize=(18, 12))
-        fig.patch.set_facecolor(PROFESSIONAL_COLORS['background'])
-        
-        # Color scheme for domestic vs international - consistent with executive palette
-        colors = {
-            'DOM': PROFESSIONAL_COLORS['primary_blue'],    # Blue for domestic (consistent)
-            'FOR': PROFESSIONAL_COLORS['primary_green']    # Green for international (consistent)
-        }
-        
-        labels = {
-            'DOM': 'Domestic Tourism (EU Residents)',
-            'FOR': 'International Tourism (Non-EU Visitors)'
-        }
-        
-        # Plot lines for each category
-        for c_resid in ['DOM', 'FOR']:
-            data_subset = monthly_recovery[monthly_recovery['c_resid'] == c_resid]
-            if not data_subset.empty:
-                ax.plot(data_subset['date'], data_subset['obs_value'], 
-                       color=colors[c_resid], linewidth=5, marker='o', markersize=8,
-                       label=labels[c_resid], alpha=0.9, markerfacecolor='white', 
-                       markeredgecolor=colors[c_resid], markeredgewidth=3)
-        
-        # Add baseline and background shading
-        ax.axhline(y=0, color=PROFESSIONAL_COLORS['primary_red'], linestyle='--', 
-                  linewidth=3, alpha=0.8, label='Pre-Pandemic Baseline (2019)')
-        
-        # Background periods
-        ax.axvspan(pd.to_datetime('2020-03'), pd.to_datetime('2021-06'), 
-                  alpha=0.3, color='#FFD6D6', label='Crisis Period', zorder=1)
-        
-        # Styling
-        ax.set_title('Domestic vs International Tourism Recovery\nEU Performance Comparison (2020-2024)', 
-                    fontsize=26, fontweight='bold', pad=35, color=PROFESSIONAL_COLORS['text_primary'])
-        ax.set_xlabel('Year', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
-        ax.set_ylabel('Performance vs 2019 Baseline (%)', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
-        
-        # Legend
-        legend = ax.legend(loc='lower right', frameon=True, fancybox=True, 
-                          shadow=True, fontsize=14, framealpha=0.95)
-        legend.get_frame().set_facecolor(PROFESSIONAL_COLORS['background'])
-        legend.get_frame().set_edgecolor(PROFESSIONAL_COLORS['silver'])
-        
-        # Executive styling
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_color(PROFESSIONAL_COLORS['silver'])
-        ax.spines['bottom'].set_color(PROFESSIONAL_COLORS['silver'])
-        ax.spines['left'].set_linewidth(1.5)
-        ax.spines['bottom'].set_linewidth(1.5)
-        
-        ax.grid(True, alpha=0.4, linestyle='-', linewidth=1.0, color=PROFESSIONAL_COLORS['grid'], zorder=0)
-        ax.set_axisbelow(True)
-        
-        ax.tick_params(axis='both', which='major', labelsize=14, colors=PROFESSIONAL_COLORS['text_secondary'])
-        ax.tick_params(axis='both', length=8, width=1.5, color=PROFESSIONAL_COLORS['silver'])
+    # Monthly means by residence type
+    monthly_recovery = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['date', 'c_resid'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid=['DOM', 'FOR'],
+        geo='EU27_2020',
+        year_range=(2020, 2024)
+    ).reset_index()
+    
+    if not monthly_recovery.empty:
         
+        draw_domestic_vs_international(monthly_recovery, 'EU',
+                                       os.path.join(OUTPUT_DIR, '7_domestic_vs_international.png'), annotate=True)
+
+def draw_domestic_vs_international(monthly_recovery, area, path, annotate=False):
+    # monthly_recovery: (date, c_resid, RECOVERY_MEASURE) rows; annotate adds the EU storyline callouts
+    # Create executive visualization
+    fig, ax = plt.subplots(figsize=(18, 12))
+    fig.patch.set_facecolor(PROFESSIONAL_COLORS['background'])
+    
+    # Color scheme for domestic vs international - consistent with executive palette
+    colors = {
+        'DOM': PROFESSIONAL_COLORS['primary_blue'],    # Blue for domestic (consistent)
+        'FOR': PROFESSIONAL_COLORS['primary_green']    # Green for international (consistent)
+    }
+    
+    labels = {
+        'DOM': 'Domestic Tourism (EU Residents)',
+        'FOR': 'International Tourism (Non-EU Visitors)'
+    }
+    
+    # Plot lines for each category
+    for c_resid in ['DOM', 'FOR']:
+        data_subset = monthly_recovery[monthly_recovery['c_resid'] == c_resid]
+        if not data_subset.empty:
+            ax.plot(data_subset['date'], data_subset[RECOVERY_MEASURE], 
+                   color=colors[c_resid], linewidth=5, marker='o', markersize=8,
+                   label=labels[c_resid], alpha=0.9, markerfacecolor='white', 
+                   markeredgecolor=colors[c_resid], markeredgewidth=3)
+    
+    # Add baseline and background shading
+    ax.axhline(y=0, color=PROFESSIONAL_COLORS['primary_red'], linestyle='--', 
+              linewidth=3, alpha=0.8, label='Pre-Pandemic Baseline (2019)')
+    
+    # Background periods
+    ax.axvspan(pd.to_datetime('2020-03'), pd.to_datetime('2021-06'), 
+              alpha=0.3, color='#FFD6D6', label='Crisis Period', zorder=1)
+    
+    # Styling
+    ax.set_title(f'Domestic vs International Tourism Recovery\n{area} Performance Comparison (2020-2024)', 
+                fontsize=26, fontweight='bold', pad=35, color=PROFESSIONAL_COLORS['text_primary'])
+    ax.set_xlabel('Year', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
+    ax.set_ylabel('Performance vs 2019 Baseline (%)', fontsize=18, color=PROFESSIONAL_COLORS['text_secondary'])
+    
+    # Legend
+    legend = ax.legend(loc='lower right', frameon=True, fancybox=True, 
+                      shadow=True, fontsize=14, framealpha=0.95)
+    legend.get_frame().set_facecolor(PROFESSIONAL_COLORS['background'])
+    legend.get_frame().set_edgecolor(PROFESSIONAL_COLORS['silver'])
+    
+    # Executive styling
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color(PROFESSIONAL_COLORS['silver'])
+    ax.spines['bottom'].set_color(PROFESSIONAL_COLORS['silver'])
+    ax.spines['left'].set_linewidth(1.5)
+    ax.spines['bottom'].set_linewidth(1.5)
+    
+    ax.grid(True, alpha=0.4, linestyle='-', linewidth=1.0, color=PROFESSIONAL_COLORS['grid'], zorder=0)
+    ax.set_axisbelow(True)
+    
+    ax.tick_params(axis='both', which='major', labelsize=14, colors=PROFESSIONAL_COLORS['text_secondary'])
+    ax.tick_params(axis='both', length=8, width=1.5, color=PROFESSIONAL_COLORS['silver'])
+    
+    if annotate:
         # Get actual data for annotations
         dom_data = monthly_recovery[monthly_recovery['c_resid'] == 'DOM'].copy()
         for_data = monthly_recovery[monthly_recovery['c_resid'] == 'FOR'].copy()
@@ -997,7 +1176,7 @@ def chart7_domestic_vs_international_recovery(df):
                 target_pos = max(0, first_2022_pos - 6)  # 6 points back instead of 5
                 
                 dom_date = dom_sorted.iloc[target_pos]['date']
-                dom_value = dom_sorted.iloc[target_pos]['obs_value']
+                dom_value = dom_sorted.iloc[target_pos][RECOVERY_MEASURE]
                 
                 ax.annotate('Domestic Tourism\nResilient Recovery', 
                            xy=(dom_date, dom_value), 
@@ -1019,7 +1198,7 @@ def chart7_domestic_vs_international_recovery(df):
                 target_pos = min(len(for_sorted) - 1, first_2023_pos + 1)  # Ensure we don't exceed bounds
                 
                 for_date = for_sorted.iloc[target_pos]['date']
-                for_value = for_sorted.iloc[target_pos]['obs_value']
+                for_value = for_sorted.iloc[target_pos][RECOVERY_MEASURE]
                 
                 ax.annotate('International Tourism\nSlower Recovery', 
                            xy=(for_date, for_value), 
@@ -1029,26 +1208,26 @@ def chart7_domestic_vs_international_recovery(df):
                            fontsize=14, ha='center', color='#4A4A4A', fontweight='bold',
                            bbox=dict(boxstyle="round,pad=0.5", facecolor=PROFESSIONAL_COLORS['background'], 
                                     edgecolor='#4A4A4A', alpha=0.9, linewidth=2))
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '7_domestic_vs_international.png'), dpi=300, bbox_inches='tight', 
-                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
-        plt.show()
+    
+    fig.tight_layout()
+    save_png(path)
+    finish_figure(fig)
 
-def chart8_seasonal_patterns_comparison(df):
+@chart('seasonal', "8. Creating seasonal patterns analysis...",
+       ['8_seasonal_patterns.png'], NIGHTS_EU, helpers=FIGURE_HELPERS + ['year_month_grid'])
+def chart8_seasonal_patterns_comparison(cube):
     
-    # Get EU monthly data for comparison periods
-    seasonal_data = df[
-        (df['geo'] == 'EU27_2020') &
-        (df['unit'] == 'NR') &
-        (df['nace_r2'] == 'I551-I553') &
-        (df['c_resid'] == 'TOTAL') &
-        (df['year'].isin([2019, 2022, 2023, 2024]))  # Pre-pandemic vs recent years
-    ]
+    # EU monthly totals for comparison periods
+    monthly_totals = cube.rollup(
+        'obs_value', 'sum', ['year', 'month'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo='EU27_2020'
+    ).reset_index()
+    monthly_totals = monthly_totals[monthly_totals['year'].isin([2019, 2022, 2023, 2024])]  # Pre-pandemic vs recent years
     
-    if not seasonal_data.empty:
-        # Group by year and month
-        monthly_totals = seasonal_data.groupby(['year', 'month'])['obs_value'].sum().reset_index()
+    if not monthly_totals.empty:
         
         # Create executive visualization
         fig, ax = plt.subplots(figsize=(18, 12))
@@ -1074,26 +1253,15 @@ def chart8_seasonal_patterns_comparison(df):
         }
         
         # Plot lines for each year
-        for year in [2019, 2022, 2023, 2024]:
-            year_data = monthly_totals[monthly_totals['year'] == year].copy()
-            if not year_data.empty:
-                year_data = year_data.sort_values('month')
-                
-                # Get values for each month
-                monthly_values = []
-                month_numbers = []
-                for month in range(1, 13):
-                    month_data = year_data[year_data['month'] == month]
-                    if not month_data.empty:
-                        monthly_values.append(month_data['obs_value'].iloc[0])
-                        month_numbers.append(month)
-                
+        grid = year_month_grid(monthly_totals, [2019, 2022, 2023, 2024])
+        for year, monthly_values in grid.iterrows():
+            if monthly_values.notna().any():
                 # Plot styling based on year
                 linewidth = 6 if year == 2019 else 4
                 alpha = 1.0 if year in [2019, 2024] else 0.8
                 linestyle = '--' if year == 2019 else '-'
                 
-                ax.plot(month_numbers, monthly_values, 
+                ax.plot(grid.columns, monthly_values.values, 
                        color=period_colors[year], linewidth=linewidth, 
                        marker='o', markersize=10 if year in [2019, 2024] else 8,
                        label=period_labels[year], alpha=alpha, 
@@ -1147,40 +1315,400 @@ def chart8_seasonal_patterns_comparison(df):
                    bbox=dict(boxstyle="round,pad=0.5", facecolor=PROFESSIONAL_COLORS['background'], 
                             edgecolor='#4A4A4A', alpha=0.9, linewidth=2))
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '8_seasonal_patterns.png'), dpi=300, bbox_inches='tight', 
-                   facecolor=PROFESSIONAL_COLORS['background'], edgecolor='none', pad_inches=0.3)
-        plt.show()
+        fig.tight_layout()
+        save_png(os.path.join(OUTPUT_DIR, '8_seasonal_patterns.png'))
+        finish_figure(fig)
 
-def main():
+def data_api_dir():
+    return os.path.join(OUTPUT_DIR, '..', 'data', f'v{DATA_API_VERSION}')
+
+@chart('data-api', "9. Writing the dashboard data API (JSON aggregates)...",
+       [f'../data/v{DATA_API_VERSION}/{dataset_file(name)}' for name in DATA_API_DATASETS + ['index']], DATA_API_DATA,
+       helpers=PROJECTION_HELPERS + ['year_month_grid', 'data_api_dir', 'dashboard_data'])
+def dashboard_data_api(cube):
+    # The numbers behind the dashboard's charts and cards, drawn in the browser from a few KB
+    # of JSON; the rollups are the ones the PNG charts use, so they come out of the cube
+    annual_totals = cube.rollup(
+        'obs_value', 'sum', ['geo', 'year'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=EU27_GEOS,
+        years=[2019, 2020]
+    ).unstack('year').reindex(index=EU27_GEOS, columns=[2019, 2020])
+    country_change = ((annual_totals[2020] - annual_totals[2019]) / annual_totals[2019] * 100).dropna().sort_values()
+    
+    country_recovery = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['geo'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=EU27_GEOS,
+        years=2024
+    ).dropna().sort_values(ascending=False)
+    
+    monthly_recovery = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['date'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo='EU27_2020',
+        year_range=(2020, 2024)
+    )
+    projection = series_projection(cube.forecast(2019, nace_r2='I551-I553', c_resid='TOTAL', geo='EU27_2020'),
+                                   'EU27_2020')
+    if projection is None:
+        projection = pd.DataFrame(columns=['forecast', 'lower', 'upper'], index=pd.DatetimeIndex([]))
     
-    df = load_data()
+    sector_names = {
+        'I553': 'Camping & Outdoor Tourism',
+        'I552': 'Holiday Rentals & Short-term Stays',
+        'I551': 'Hotels & Traditional Lodging'
+    }
+    sector_performance = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['nace_r2'],
+        unit='NR',
+        nace_r2=['I551', 'I552', 'I553'],
+        c_resid='TOTAL',
+        years=2024
+    ).reindex(list(sector_names)).dropna()
+    
+    monthly_totals = cube.rollup(
+        'obs_value', 'sum', ['year', 'month'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo='EU27_2020'
+    ).reset_index()
+    years = sorted(int(year) for year in monthly_totals['year'].unique())
+    monthly_grid = year_month_grid(monthly_totals, years)
+    
+    residence_recovery = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['date', 'c_resid'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid=['DOM', 'FOR'],
+        geo='EU27_2020',
+        year_range=(2020, 2024)
+    ).unstack('c_resid').reindex(columns=['DOM', 'FOR'])
+    
+    datasets = {
+        'country_change': {'from': 2019, 'to': 2020, 'geo': list(country_change.index),
+                           'name': [COUNTRY_NAMES[geo] for geo in country_change.index],
+                           'change': column(country_change)},
+        'recovery_2024': {'year': 2024, 'geo': list(country_recovery.index),
+                          'name': [COUNTRY_NAMES[geo] for geo in country_recovery.index],
+                          'recovery': column(country_recovery)},
+        'trajectory': {'geo': 'EU27_2020', 'period': periods(monthly_recovery.index),
+                       'recovery': column(monthly_recovery),
+                       'projection': {'period': periods(projection.index), 'forecast': column(projection['forecast']),
+                                      'lower': column(projection['lower']), 'upper': column(projection['upper'])}},
+        'sectors': {'year': 2024, 'nace_r2': list(sector_performance.index),
+                    'name': [sector_names[sector] for sector in sector_performance.index],
+                    'recovery': column(sector_performance)},
+        'monthly': {'geo': 'EU27_2020', 'years': years, 'nights': [column(row, 0) for row in monthly_grid.to_numpy()]},
+        'residence': {'geo': 'EU27_2020', 'period': periods(residence_recovery.index),
+                      'DOM': column(residence_recovery['DOM']), 'FOR': column(residence_recovery['FOR'])},
+    }
+    write_datasets(datasets, data_api_dir())
 
-    chart5_monthly_tourism_journey(df)
+def country_recovery_rollups(cube):
+    # One rollup per chart type across every country; each country's chart slices its rows
+    # out of these instead of querying the dataset again
+    trajectory = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['geo', 'date'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid='TOTAL',
+        geo=EU27_GEOS,
+        year_range=(2020, 2024)
+    )
+    residence = cube.rollup(
+        RECOVERY_MEASURE, 'mean', ['geo', 'date', 'c_resid'],
+        unit='NR',
+        nace_r2='I551-I553',
+        c_resid=['DOM', 'FOR'],
+        geo=EU27_GEOS,
+        year_range=(2020, 2024)
+    )
+    projection = cube.forecast(2019, nace_r2='I551-I553', c_resid='TOTAL', geo=EU27_GEOS)
+    return trajectory, residence, projection
+
+def country_chart_path(geo, kind):
+    return os.path.join(OUTPUT_DIR, 'countries', f'{geo}_{kind}.png')
+
+def country_charts(geo, cube):
+    trajectory, residence, projection = country_recovery_rollups(cube)
+    name = COUNTRY_NAMES.get(geo, geo)
+    
+    if geo in trajectory.index.get_level_values('geo'):
+        draw_recovery_trajectory(trajectory.xs(geo, level='geo'), f'{name} Tourism Recovery Trajectory',
+                                 country_chart_path(geo, 'recovery_trajectory'),
+                                 projection=series_projection(projection, geo))
+    if geo in residence.index.get_level_values('geo'):
+        draw_domestic_vs_international(residence.xs(geo, level='geo').reset_index(), name,
+                                       country_chart_path(geo, 'domestic_vs_international'))
+
+def render_country_charts(cube, workers):
+    # Every country's trajectory and domestic/international chart, one job per country
+    trajectory, residence, _ = country_recovery_rollups(cube)
+    trajectory_geos = set(trajectory.index.get_level_values('geo'))
+    residence_geos = set(residence.index.get_level_values('geo'))
+    geos = sorted(trajectory_geos | residence_geos)
+    if not geos:
+        print("No country data to chart")
+        return 0
+    
+    os.makedirs(os.path.join(OUTPUT_DIR, 'countries'), exist_ok=True)
+    jobs = [(f'country_charts_{geo}', functools.partial(country_charts, geo)) for geo in geos]
+    
+    print(f"Rendering charts for {len(geos)} countries with {workers} worker process(es)...")
+    start = time.perf_counter()
+    results = run_jobs(jobs, cube, workers=workers,
+                       on_done=lambda result: print(f"  {'done' if result['ok'] else 'FAILED'}: "
+                                                    f"{result['name']} ({result['seconds']:.1f}s)"))
+    elapsed = time.perf_counter() - start
+    
+    failed = [result for result in results if not result['ok']]
+    for result in failed:
+        print(f"\n{result['name']} failed:\n{result['error']}")
+    
+    failed_geos = {result['name'].rsplit('_', 1)[1] for result in failed}
+    charts = len(trajectory_geos - failed_geos) + len(residence_geos - failed_geos)
+    print(f"Rendered {charts} country charts in {elapsed:.1f}s ({charts / elapsed:.2f} charts/s)")
+    return 1 if failed else 0
+
+def expand_outputs(outputs, map_formats, **fields):
+    # '{map}' expands to one output per map format; other fields (e.g. level) are filled in
+    expanded = []
+    for output in outputs:
+        if '{map}' in output:
+            expanded.extend(output.format(map=fmt, **fields) for fmt in map_formats)
+        else:
+            expanded.append(output.format(**fields))
+    return expanded
+
+def ingest_delta(data_file, rebuild_cache=False):
+    # Diffs the extract against the stored dataset, upserts the changed observations and returns
+    # (stored frame, changed partitions); partitions is None when there was nothing to diff against
+    incoming = load_cached(data_file, load_data, rebuild=rebuild_cache)
+    stored = load_store()
+    if stored is None:
+        print(f"No stored dataset yet; storing all {len(incoming):,} observations")
+        save_store(incoming, {'source': os.path.abspath(data_file), 'inserted': len(incoming)})
+        return incoming, None
+    
+    delta = diff_frames(stored, incoming)
+    partitions = changed_partitions(stored, incoming, delta)
+    print(f"Delta vs stored dataset: {len(delta['inserted']):,} inserted, {len(delta['updated']):,} updated, "
+          f"{len(delta['deleted']):,} deleted in {len(partitions)} partition(s)")
+    for line in describe_partitions(partitions):
+        print(f"  {line}")
+    if partitions.empty:
+        return stored, partitions
+    
+    df = apply_delta(stored, incoming, delta)
+    save_store(df, delta_summary(delta, partitions, data_file))
+    return df, partitions
+
+def finish_metrics():
+    # Writes the run-level stages still pending and prints the per-chart table
+    if metrics.enabled:
+        metrics.close()
+        metrics.print_summary()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Render the EU tourism recovery charts.')
+    parser.add_argument('--data-file', default=DATA_FILE,
+                        help='Eurostat tour_occ_nim SDMX-CSV export or bulk .tsv download, optionally gzipped')
+    parser.add_argument('--only', nargs='+', metavar='CHART', help='render only these charts (see --list)')
+    parser.add_argument('--exclude', nargs='+', metavar='CHART', help='render every chart except these')
+    parser.add_argument('--list', action='store_true', help='list the available charts and exit')
+    parser.add_argument('--no-cache', action='store_true', help='always parse the CSV, bypassing the cleaned-data cache')
+    parser.add_argument('--rebuild-cache', action='store_true', help='re-parse the CSV and overwrite its cache entry')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the CSV in chunks and keep only the rows the charts use (for extracts larger '
+                             'than memory; bypasses the cache)')
+    parser.add_argument('--chunk-rows', type=int, default=STREAM_CHUNK_ROWS, metavar='N',
+                        help=f'with --stream, rows read per chunk (default {STREAM_CHUNK_ROWS}; for a bulk TSV '
+                             f'each row is one series across every period)')
+    parser.add_argument('--prune-cache', action='store_true', help='delete stale cache entries and exit')
+    parser.add_argument('--max-cache-age', type=float, default=None, metavar='DAYS',
+                        help='with --prune-cache, also drop entries older than DAYS')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                        help='render charts in N worker processes (0 = one per CPU, default 1 = serial)')
+    parser.add_argument('--preview', nargs='?', const='', default=None, metavar='BACKEND',
+                        help='show each chart in an interactive window (optionally with the given matplotlib backend)')
+    parser.add_argument('--map-format', choices=['json', 'html', 'both'], default='json',
+                        help='interactive map output: JSON specs for the dashboard (default), '
+                             'standalone HTML with plotly.js inlined, or both')
+    parser.add_argument('--nuts-geojson', metavar='PATH',
+                        help='also draw a region-level recovery map from this NUTS GeoJSON (e.g. a GISCO NUTS export)')
+    parser.add_argument('--nuts-level', type=int, choices=[0, 1, 2, 3], default=2,
+                        help='with --nuts-geojson, the NUTS level to map (default 2)')
+    parser.add_argument('--simplify-tolerance', type=float, default=0.01, metavar='DEGREES',
+                        help='with --nuts-geojson, Douglas-Peucker tolerance for the cached geometry (default 0.01)')
+    parser.add_argument('--all-countries', action='store_true',
+                        help='render the recovery trajectory and domestic vs international charts for every '
+                             'EU country into assets/images/countries and exit')
+    parser.add_argument('--force', action='store_true',
+                        help='re-render every chart, ignoring the build manifest')
+    parser.add_argument('--skip-variants', action='store_true',
+                        help='do not rebuild the responsive AVIF/WebP/PNG variants of the rendered charts')
+    parser.add_argument('--delta', action='store_true',
+                        help='diff --data-file against the stored dataset (data/store), apply its inserts, updates and '
+                             'deletes, report the affected aggregates and charts and rebuild only those')
+    parser.add_argument('--metrics', nargs='?', const='', default=None, metavar='JSONL',
+                        help='time every stage (load, filter, aggregate, draw, save) with bytes written and RSS, '
+                             'print a summary table and append the events as JSON lines to JSONL (- for stdout)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    if args.prune_cache:
+        removed = prune_cache(max_age_days=args.max_cache_age)
+        print(f"Pruned {len(removed)} cache file(s)")
+        return 0
+    
+    if args.list:
+        for entry in CHARTS:
+            needs = f" (needs --{entry['needs'].replace('_', '-')})" if entry['needs'] else ''
+            print(f"{entry['name']:<20} {', '.join(entry['outputs'])}{needs}")
+        return 0
+    
+    if args.metrics is not None:
+        metrics.enable(args.metrics or None)
+    
+    try:
+        charts = select_charts(CHARTS, args.only, args.exclude)
+    except ValueError as e:
+        print(e)
+        return 2
+    unavailable = [entry for entry in charts if entry['needs'] and not getattr(args, entry['needs'])]
+    if args.only and unavailable:
+        print(f"{', '.join(entry['name'] for entry in unavailable)} needs "
+              f"{', '.join(sorted({'--' + entry['needs'].replace('_', '-') for entry in unavailable}))}")
+        return 2
+    charts = [entry for entry in charts if entry not in unavailable]
+    
+    global NUTS_MAP
+    if args.nuts_geojson and any(entry['needs'] == 'nuts_geojson' for entry in charts):
+        regions = load_regions(args.nuts_geojson, args.nuts_level, args.simplify_tolerance)
+        NUTS_MAP = {'level': args.nuts_level, 'tolerance': args.simplify_tolerance, 'regions': regions,
+                    'source_hash': hash_file(args.nuts_geojson)}
+        print(f"Loaded {len(regions['features'])} NUTS {args.nuts_level} regions")
+    
+    # Only the rows the selected charts read are loaded and indexed
+    keep = COUNTRY_CHARTS_DATA if args.all_countries else merge_data([entry['data'] for entry in charts])
+    partitions = None
+    with metrics.stage('load'):
+        if args.delta:
+            df, partitions = ingest_delta(args.data_file, args.rebuild_cache)
+            df = select_rows(df, keep)
+        elif args.stream:
+            df = stream_data(args.data_file, keep=keep, chunksize=args.chunk_rows)
+        elif args.no_cache:
+            df = select_rows(load_data(args.data_file), keep)
+        else:
+            df = load_cached(args.data_file, load_data, rebuild=args.rebuild_cache, keep=keep)
+    with metrics.stage('index'):
+        cube = AggregateCube(TourismDataset(df))
+    
+    if args.all_countries:
+        status = render_country_charts(cube, resolve_workers(args.jobs))
+        finish_metrics()
+        return status
+    
+    global MAP_FORMATS
+    MAP_FORMATS = ['json', 'html'] if args.map_format == 'both' else [args.map_format]
+    if 'json' in MAP_FORMATS and any('{map}' in output for entry in charts for output in entry['outputs']) \
+            and write_shared_plotlyjs(PLOTLYJS_FILE):
+        print(f"Wrote shared plotly.js to {os.path.relpath(PLOTLYJS_FILE)}")
+    
+    job_styles = {}
+    if NUTS_MAP:
+        level = NUTS_MAP['level']
+        if write_regions(NUTS_MAP['regions'], nuts_geometry_file(level)):
+            print(f"Wrote simplified NUTS {level} geometry to {os.path.relpath(nuts_geometry_file(level))}")
+        job_styles[chart_nuts_recovery_map.__name__] = {key: NUTS_MAP[key] for key in ('level', 'tolerance', 'source_hash')}
+    
+    manifest = load_manifest()
+    jobs = [(entry['func'].__name__, entry['func'], expand_outputs(entry['outputs'], MAP_FORMATS, level=args.nuts_level))
+            for entry in charts]
+    job_helpers = {entry['func'].__name__: entry['helpers'] for entry in charts}
+    unaffected = []
+    if partitions is not None:
+        affected, n_affected, n_recorded = affected_charts(manifest, partitions)
+        print(f"{n_affected} of {n_recorded} recorded aggregate(s) affected; charts affected: "
+              f"{', '.join(affected) or 'none'}")
+        unaffected = [name for name in manifest['charts'] if name not in affected]
+    if args.force:
+        skipped = []
+    else:
+        with metrics.stage('plan'):
+            jobs, skipped = plan_rebuild(manifest, jobs, cube, OUTPUT_DIR, RENDER_STYLE, job_styles, unaffected,
+                                         job_helpers)
+    
+    if skipped:
+        print(f"Skipping {len(skipped)} unchanged chart(s): {', '.join(skipped)}")
+    if not jobs:
+        print("Nothing to rebuild")
+        finish_metrics()
+        return 0
     
-    print("1. Creating COVID-19 impact analysis (Executive Version)...")
-    chart1_covid_impact_professional(df)
+    workers = resolve_workers(args.jobs)
+    if args.preview is not None:
+        backend = enable_preview(args.preview or None)
+        if backend:
+            print(f"Previewing charts with the {backend} backend")
+            workers = 1
+        else:
+            print("No interactive matplotlib backend available; rendering headless")
     
-    print("1b. Creating COVID-19 impact map (EU Countries)...")
-    chart1_covid_impact_map(df)
+    messages = {entry['func'].__name__: entry['message'] for entry in charts}
+    render_list = [(name, func) for name, func, _ in jobs]
     
-    print("2a. Creating 2024 recovery map (EU Countries)...")
-    chart2_recovery_map_journalism(df)
+    if workers == 1:
+        results = run_jobs(render_list, cube, finalize=flush_exports,
+                           on_start=lambda name: print(messages[name]))
+    else:
+        print(f"Rendering {len(render_list)} charts with {workers} worker processes...")
+        results = run_jobs(render_list, cube, workers=workers, finalize=flush_exports,
+                           on_done=lambda result: print(f"  {'done' if result['ok'] else 'FAILED'}: "
+                                                        f"{result['name']} ({result['seconds']:.1f}s)"))
     
-    print("2. Creating recovery trajectory analysis (Executive Version)...")
-    chart2_recovery_trajectory_professional(df)
+    with metrics.stage('manifest'):
+        save_manifest(record_results(manifest, jobs, results, cube, RENDER_STYLE, job_styles, job_helpers))
     
-    print("3. Creating market performance comparison (Executive Version)...")
-    chart3_country_performance_professional(df)
+    if not args.skip_variants:
+        rendered = {result['name'] for result in results if result['ok']}
+        sources = [os.path.join(OUTPUT_DIR, output) for name, _, outputs in jobs if name in rendered
+                   for output in outputs if output.endswith('.png')]
+        sources = [path for path in sources if os.path.exists(path)]
+        if sources:
+            with metrics.stage('variants'):
+                written = build_image_variants(sources, os.path.join(OUTPUT_DIR, 'responsive'), workers=workers)
+            print(f"Wrote {written} responsive image variant(s) for {len(sources)} image(s)")
     
-    print("4. Creating accommodation sector analysis (Executive Version)...")
-    chart4_accommodation_sectors_professional(df)
+    failed = [result for result in results if not result['ok']]
+    for result in failed:
+        print(f"\n{result['name']} failed:\n{result['error']}")
+    for result in results:
+        if result['ok'] and result['incomplete']:
+            print(f"{result['name']} left {', '.join(result['incomplete'])} unwritten; it will be rebuilt next run")
     
-    print("7. Creating domestic vs international recovery comparison...")
-    chart7_domestic_vs_international_recovery(df)
+    if exporter.timings:
+        exported = [timing for timing in exporter.timings if timing['status'] == 'ok']
+        print(f"Map exports: {len(exported)} written in {sum(t['seconds'] for t in exported):.1f}s, "
+              f"{len(exporter.timings) - len(exported)} skipped")
     
-    print("8. Creating seasonal patterns analysis...")
-    chart8_seasonal_patterns_comparison(df)
+    summary = f"Done: {len(results) - len(failed)}/{len(results)} charts rebuilt, {len(skipped)} skipped"
+    if workers == 1:
+        summary += f", {cube.summary()}"
+    print(summary)
+    finish_metrics()
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from collections import OrderedDict
+import pandas as pd
+import numpy as np
+import threading
+import traceback
+import argparse
+import hashlib
+import gzip
+import json
+import time
+import re
+
+from eurostat_reader import DATA_FILE, load_data
+from data_cache import load_cached
+from tourism_dataset import KEY_COLUMNS, TourismDataset
+from tourism_indicators import parse_indicator
+from dashboard_data import column, periods
+
+API_PREFIX = '/api/v1'
+AGGREGATIONS = ['sum', 'mean', 'median', 'min', 'max', 'count']
+GROUP_COLUMNS = KEY_COLUMNS + ['year', 'month', 'date']
+
+# Bodies smaller than this are sent uncompressed; gzip would barely shrink them
+GZIP_MIN_BYTES = 1024
+
+DEFAULT_CACHE_MB = 64
+
+MONTH_PATTERN = re.compile(r'\d{4}-\d{2}')
+
+class ResultCache:
+    # Serialized responses keyed by the normalized query, least recently used first. Size is the
+    # bytes held (plain + gzipped body); inserting past max_bytes evicts from the old end
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.computing = {}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+    def peek(self, key):
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key, entry):
+        size = len(entry['body']) + len(entry['gzip'] or b'')
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                old = self.entries.pop(key)
+                self.bytes -= len(old['body']) + len(old['gzip'] or b'')
+            self.entries[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, old = self.entries.popitem(last=False)
+                self.bytes -= len(old['body']) + len(old['gzip'] or b'')
+
+    def key_lock(self, key):
+        # Lock held while key is computed: a second request for it waits for the result instead
+        # of computing it again, and requests for other keys are not held up
+        with self.lock:
+            return self.computing.setdefault(key, threading.Lock())
+
+    def release_key(self, key, lock):
+        with self.lock:
+            if self.computing.get(key) is lock:
+                del self.computing[key]
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+def split_values(params, name):
+    # 'geo=ES,FR&geo=IT' -> ['ES', 'FR', 'IT']; None when the parameter is absent
+    if name not in params:
+        return None
+    return [value for raw in params[name] for value in raw.split(',') if value]
+
+def parse_month(value, name):
+    # Only the full YYYY-MM form; pandas would read a bare '2024' as January
+    try:
+        if not MONTH_PATTERN.fullmatch(value):
+            raise ValueError(value)
+        return pd.Period(value, freq='M')
+    except ValueError:
+        raise ValueError(f"{name} must be a month like 2024-03, got {value!r}")
+
+def normalize_query(params):
+    # Validated, canonical form of an aggregate query; equal queries give equal keys
+    unknown = set(params) - {'measure', 'agg', 'by', 'from', 'to'} - set(KEY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+    measure = (split_values(params, 'measure') or ['obs_value'])[0]
+    if measure != 'obs_value' and parse_indicator(measure) is None:
+        raise ValueError(f"Unknown measure: {measure}")
+    agg = (split_values(params, 'agg') or ['sum'])[0]
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"agg must be one of {', '.join(AGGREGATIONS)}")
+    by = split_values(params, 'by') or []
+    bad = [name for name in by if name not in GROUP_COLUMNS]
+    if bad or len(set(by)) != len(by):
+        raise ValueError(f"by takes distinct columns of {', '.join(GROUP_COLUMNS)}")
+
+    query = {'measure': measure, 'agg': agg, 'by': by}
+    for name in KEY_COLUMNS:
+        values = split_values(params, name)
+        query[name] = sorted(set(values)) if values is not None else None
+    for name in ('from', 'to'):
+        values = split_values(params, name)
+        query[name] = str(parse_month(values[0], name)) if values else None
+    if query['from'] and query['to'] and query['from'] > query['to']:
+        raise ValueError("from is after to")
+    return query
+
+def year_bounds(dataset):
+    # (first, last) year present in the data, None when it is empty
+    years = {int(key[-1]) for key in dataset.year_slices}
+    return (min(years), max(years)) if years else None
+
+def run_query(dataset, query, years):
+    # years: the data's (first, last) year; an open end of the month range stops there, as the
+    # year index is walked one year at a time
+    first = parse_month(query['from'], 'from') if query['from'] else None
+    last = parse_month(query['to'], 'to') if query['to'] else None
+    year_range = None
+    if (first or last) and years:
+        year_range = (max(first.year, years[0]) if first else years[0], min(last.year, years[1]) if last else years[1])
+
+    measure = query['measure']
+    indicator = parse_indicator(measure)
+    if indicator and indicator[1] is not None and not (years and years[0] <= indicator[1] <= years[1]):
+        raise ValueError(f"Base year {indicator[1]} is outside the data"
+                         + (f" ({years[0]}-{years[1]})" if years else ""))
+
+    filters = {name: query[name] for name in KEY_COLUMNS}
+    if indicator:
+        # Indicators read whole series (baseline months, the year before), so the year filter
+        # waits for the month trim below; the shared frame never gains a column per measure
+        data = dataset.query(**filters)
+        data = data.assign(**{measure: dataset.measure_values(data, measure)})
+    else:
+        data = dataset.query(**filters, year_range=year_range)
+    if first or last:
+        # Whole years came back from the year index; trim the partial ones by month
+        months = data['year'].to_numpy().astype(np.int64) * 12 + data['month'].to_numpy() - 1
+        mask = np.ones(len(data), dtype=bool)
+        if first:
+            mask &= months >= first.year * 12 + first.month - 1
+        if last:
+            mask &= months <= last.year * 12 + last.month - 1
+        data = data[mask]
+
+    if query['by']:
+        result = data.groupby(query['by'], observed=True)[measure].agg(query['agg'])
+        frame = result.reset_index()
+    else:
+        frame = pd.DataFrame({measure: [data[measure].agg(query['agg'])]})
+
+    out = {}
+    for name in query['by']:
+        if name == 'date':
+            out[name] = periods(frame[name])
+        elif name in ('year', 'month'):
+            out[name] = [int(value) for value in frame[name]]
+        else:
+            out[name] = [str(value) for value in frame[name]]
+    out['value'] = column(frame[measure], 0 if query['agg'] == 'count' else 2)
+    return {'query': query, 'rows': len(frame), 'data': out}
+
+def response_entry(payload):
+    # The gzipped body is a different representation, so it gets its own strong ETag
+    body = json.dumps(payload, separators=(',', ':'), allow_nan=False).encode()
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return {'body': body, 'gzip': gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None,
+            'etag': f'"{digest}"', 'gzip_etag': f'"{digest}-gz"'}
+
+def etag_matches(header, etag):
+    # If-None-Match: '*' or a comma-separated list of tags, compared weakly (W/ ignored)
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return any(tag == '*' or tag.removeprefix('W/') == etag for tag in tags)
+
+def dimensions_payload(dataset):
+    years = year_bounds(dataset)
+    return {'dimensions': {col: dataset.values(col) for col in KEY_COLUMNS},
+            'years': list(years) if years else None,
+            'measures': ['obs_value', 'pct_vs_YYYY', 'pct_vs_YYYY-MM', 'yoy', 'index_YYYY', 'index_YYYY-MM'],
+            'aggregations': AGGREGATIONS, 'group_by': GROUP_COLUMNS}
+
+class QueryHandler(BaseHTTPRequestHandler):
+    # Set on the server: dataset, years, cache, dimensions, verbose
+    server_version = 'TourismQuery/1'
+    protocol_version = 'HTTP/1.1'
+    head_only = False
+
+    def do_HEAD(self):
+        # Same status and headers as GET, without the body
+        self.head_only = True
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path == f'{API_PREFIX}/aggregate':
+                query = normalize_query(parse_qs(url.query))
+                key = json.dumps(query, sort_keys=True)
+                entry = self.server.cache.get(key)
+                if entry is None:
+                    # A query that just missed may have been answered meanwhile
+                    lock = self.server.cache.key_lock(key)
+                    try:
+                        with lock:
+                            entry = self.server.cache.peek(key)
+                            if entry is None:
+                                entry = response_entry(run_query(self.server.dataset, query, self.server.years))
+                                self.server.cache.put(key, entry)
+                    finally:
+                        self.server.cache.release_key(key, lock)
+            elif url.path == f'{API_PREFIX}/dimensions':
+                entry = self.server.dimensions
+            elif url.path == f'{API_PREFIX}/stats':
+                entry = response_entry(self.server.cache.stats())
+            else:
+                self.send_json(404, {'error': f"Unknown path: {url.path}"})
+                return
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        except Exception:
+            # Anything else is a bug, not a bad query; answer anyway so the client is not left hanging
+            traceback.print_exc()
+            self.send_json(500, {'error': 'Internal error while answering the query'})
+            return
+        self.send_entry(entry)
+
+    def send_entry(self, entry):
+        use_gzip = entry['gzip'] is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        etag = entry['gzip_etag'] if use_gzip else entry['etag']
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_common_headers(etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = entry['gzip'] if use_gzip else entry['body']
+        self.send_response(200)
+        self.send_common_headers(etag)
+        self.send_header('Content-Type', 'application/json')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not self.head_only:
+            self.wfile.write(body)
+
+    def send_common_headers(self, etag):
+        # The dashboard may be opened from another origin (file:// or a static server); clients
+        # revalidate with the ETag, which stays the same for as long as the loaded data does
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not self.head_only:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def make_server(dataset, host='127.0.0.1', port=8765, cache_mb=DEFAULT_CACHE_MB, verbose=False):
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.dataset = dataset
+    server.years = year_bounds(dataset)
+    server.cache = ResultCache(int(cache_mb * 2**20))
+    server.dimensions = response_entry(dimensions_payload(dataset))
+    server.verbose = verbose
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve filter/aggregate queries over the cleaned dataset as JSON.')
+    parser.add_argument('--data-file', default=DATA_FILE,
+                        help='Eurostat extract: SDMX-CSV or bulk TSV, optionally gzipped')
+    parser.add_argument('--host', default='127.0.0.1', help='interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_CACHE_MB, metavar='MB',
+                        help=f'size of the LRU result cache (default: {DEFAULT_CACHE_MB})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always parse the data file, bypassing the cleaned-data cache')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df = load_data(args.data_file) if args.no_cache else load_cached(args.data_file, load_data)
+    dataset = TourismDataset(df)
+    del df
+    print(f"Loaded {len(dataset.df):,} observations in {time.perf_counter() - start:.1f}s")
+
+    server = make_server(dataset, args.host, args.port, args.cache_mb, args.verbose)
+    print(f"Serving {API_PREFIX}/aggregate, {API_PREFIX}/dimensions and {API_PREFIX}/stats "
+          f"on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from run_metrics import metrics
+import multiprocessing
+import traceback
+import time
+import os
+
+# The cube each worker renders from. With the fork start method the parent's cube is
+# inherited copy-on-write; elsewhere it is pickled once per worker, not once per chart.
+worker_cube = None
+
+def init_worker(cube, metrics_enabled=False):
+    global worker_cube
+    import matplotlib
+    matplotlib.use('Agg')
+    worker_cube = cube
+    # Workers only collect events; the parent writes them out as results come back
+    metrics.enabled = metrics_enabled
+
+def run_job(name, func, cube, finalize=None):
+    # One chart; failures are recorded rather than raised so the remaining charts still render.
+    # finalize runs after the chart inside the same error handling (e.g. flushing queued exports);
+    # outputs it reports as not written leave the chart incomplete, so it is not recorded as built.
+    start = time.perf_counter()
+    metrics.start_chart(name)
+    cube.start_recording()
+    incomplete = []
+    try:
+        func(cube)
+        if finalize:
+            incomplete = [timing['output'] for timing in finalize() or [] if timing['status'] != 'ok']
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        # Drop any figure a failed chart left open so memory stays flat across the run
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    rollups = cube.stop_recording()
+    seconds = time.perf_counter() - start
+    return {'name': name, 'ok': error is None, 'error': error, 'seconds': seconds, 'rollups': rollups,
+            'incomplete': incomplete, 'metrics': metrics.finish_chart(seconds)}
+
+def run_worker_job(name, func, finalize=None):
+    return run_job(name, func, worker_cube, finalize)
+
+def resolve_workers(workers):
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+def pool_context():
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+def run_jobs(jobs, cube, workers=1, finalize=None, on_start=None, on_done=None):
+    # jobs is a list of (name, func) pairs; results come back in job order
+    results = {}
+    # Write out earlier stages first so forked workers do not inherit them
+    metrics.write(metrics.collect())
+    if workers == 1 or len(jobs) <= 1:
+        for name, func in jobs:
+            if on_start:
+                on_start(name)
+            results[name] = run_job(name, func, cube, finalize)
+            metrics.write(results[name]['metrics'])
+            if on_done:
+                on_done(results[name])
+        return [results[name] for name, _ in jobs]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=pool_context(),
+                             initializer=init_worker, initargs=(cube, metrics.enabled)) as pool:
+        futures = {}
+        for name, func in jobs:
+            if on_start:
+                on_start(name)
+            futures[pool.submit(run_worker_job, name, func, finalize)] = name
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception:
+                # The worker itself died (e.g. killed or the job could not be pickled)
+                results[name] = {'name': name, 'ok': False, 'error': traceback.format_exc(), 'seconds': 0.0,
+                                 'rollups': [], 'incomplete': [], 'metrics': []}
+            metrics.write(results[name]['metrics'])
+            if on_done:
+                on_done(results[name])
+
+    return [results[name] for name, _ in jobs]
@@ -0,0 +1,166 @@
+from datetime import datetime
+import json
+import time
+import sys
+import os
+
+try:
+    import resource
+except ImportError:
+    # Windows: peak RSS comes from psutil when it is installed, else it is reported as unavailable
+    resource = None
+
+def current_rss():
+    # Resident set size in bytes; None where /proc is not available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def peak_rss():
+    # High-water mark of this process in bytes, None where it cannot be read; ru_maxrss is
+    # already bytes on macOS, KB elsewhere
+    if resource is None:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset
+        except (ImportError, AttributeError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+# Column order of the summary table; stages not listed follow in the order they were seen
+STAGE_ORDER = ['load', 'index', 'plan', 'derive', 'filter', 'aggregate', 'forecast', 'draw', 'savefig', 'write_json',
+               'write_html', 'write_image', 'chart', 'manifest', 'variants']
+
+class NoStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NO_STAGE = NoStage()
+
+class Stage:
+    def __init__(self, recorder, name, output):
+        self.recorder = recorder
+        self.name = name
+        self.output = output
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        event = {'stage': self.name, 'chart': self.recorder.chart, 'seconds': round(seconds, 6)}
+        if self.output is not None:
+            event['output'] = os.path.basename(self.output)
+            event['bytes'] = os.path.getsize(self.output) if os.path.exists(self.output) else 0
+        rss = current_rss()
+        if rss is not None:
+            event['rss_mb'] = round(rss / 2**20, 1)
+        peak = peak_rss()
+        if peak is not None:
+            event['peak_rss_mb'] = round(peak / 2**20, 1)
+        event['pid'] = os.getpid()
+        self.recorder.events.append(event)
+        return False
+
+class MetricsRecorder:
+    # Per-stage timings of a run, off unless enable() is called. Disabled, stage() hands back
+    # one shared no-op context manager, so instrumented code pays a single attribute check.
+    # Events are collected in whichever process ran the stage; pool workers return theirs with
+    # the job result and the parent writes them out.
+
+    def __init__(self):
+        self.enabled = False
+        self.chart = None
+        self.events = []
+        self.written = []
+        self.file = None
+        self.stdout = False
+        self.run = None
+
+    def enable(self, path=None):
+        # path: JSON-lines file the events are appended to, '-' for stdout, None to keep them
+        # for the summary table only. Every line carries the run's start time, so appended
+        # nightly runs can be told apart
+        self.enabled = True
+        self.run = datetime.now().isoformat(timespec='seconds')
+        if path == '-':
+            self.stdout = True
+        elif path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.file = open(path, 'a')
+
+    def stage(self, name, output=None):
+        if not self.enabled:
+            return NO_STAGE
+        return Stage(self, name, output)
+
+    def start_chart(self, name):
+        self.chart = name
+
+    def finish_chart(self, seconds):
+        # Drawing is whatever the chart spent outside the stages timed on its own
+        if not self.enabled:
+            return []
+        chart, self.chart = self.chart, None
+        timed = sum(event['seconds'] for event in self.events if event['chart'] == chart)
+        self.events.append({'stage': 'draw', 'chart': chart, 'seconds': round(max(seconds - timed, 0.0), 6),
+                            'pid': os.getpid()})
+        self.events.append({'stage': 'chart', 'chart': chart, 'seconds': round(seconds, 6), 'pid': os.getpid()})
+        return self.collect()
+
+    def collect(self):
+        events, self.events = self.events, []
+        return events
+
+    def write(self, events):
+        if not self.enabled:
+            return
+        for event in events:
+            self.written.append(event)
+            line = json.dumps(dict(run=self.run, **event))
+            if self.stdout:
+                print(line)
+            elif self.file:
+                self.file.write(line + '\n')
+        if self.file:
+            self.file.flush()
+
+    def close(self):
+        self.write(self.collect())
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def summary_rows(self):
+        # One row per chart (run-level stages under '-'): seconds per stage, bytes and peak RSS
+        rows = {}
+        for event in self.written:
+            row = rows.setdefault(event['chart'] or '-', {'stages': {}, 'bytes': 0, 'peak_rss_mb': None})
+            row['stages'][event['stage']] = row['stages'].get(event['stage'], 0.0) + event['seconds']
+            row['bytes'] += event.get('bytes', 0)
+            if 'peak_rss_mb' in event:
+                row['peak_rss_mb'] = max(row['peak_rss_mb'] or 0.0, event['peak_rss_mb'])
+        return rows
+
+    def print_summary(self):
+        rows = self.summary_rows()
+        if not rows:
+            return
+        stages = [stage for stage in STAGE_ORDER if any(stage in row['stages'] for row in rows.values())]
+        for row in rows.values():
+            stages.extend(stage for stage in row['stages'] if stage not in stages)
+        print(f"\n{'stage seconds':<44}" + ''.join(f"{stage:>11}" for stage in stages) + f"{'MB out':>9}{'peak MB':>9}")
+        for name, row in rows.items():
+            cells = ''.join(f"{row['stages'][stage]:11.3f}" if stage in row['stages'] else f"{'':>11}"
+                            for stage in stages)
+            peak = f"{row['peak_rss_mb']:9.0f}" if row['peak_rss_mb'] is not None else f"{'n/a':>9}"
+            print(f"{name:<44}{cells}{row['bytes'] / 2**20:9.1f}{peak}")
+
+metrics = MetricsRecorder()
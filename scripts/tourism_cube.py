@@ -0,0 +1,85 @@
+from tourism_forecast import FORECAST_HORIZON, forecast_recovery
+from tourism_dataset import as_list
+from run_metrics import metrics
+
+# Series the forecasts are fitted on, one model each
+FORECAST_DIMS = ['geo', 'nace_r2', 'c_resid']
+
+def freeze(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return tuple(as_list(value))
+
+def cache_key(measure, agg, dims, filters):
+    return (measure, agg, tuple(dims), tuple(sorted((name, freeze(value)) for name, value in filters.items())))
+
+def rollup_spec(measure, agg, dims, filters):
+    # JSON-friendly form of a rollup request, replayable through AggregateCube.rollup_from_spec()
+    return {
+        'measure': measure,
+        'agg': agg,
+        'dims': list(dims),
+        'filters': {name: value if isinstance(value, (str, int, float)) or value is None else list(value)
+                    for name, value in sorted(filters.items())},
+    }
+
+class AggregateCube:
+    # Memoized rollups over a TourismDataset. Every chart asks for its aggregate by
+    # (measure, agg, dims, filters); the first request computes it and later requests for
+    # the same key reuse the stored result for the rest of the run.
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.results = {}
+        self.forecasts = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = None
+
+    def rollup(self, measure, agg, dims, **filters):
+        # filters are passed straight to TourismDataset.query(); measure is 'obs_value' or one
+        # of the indicators of tourism_indicators.py
+        key = cache_key(measure, agg, dims, filters)
+        if self.recorded is not None:
+            self.recorded.append(rollup_spec(measure, agg, dims, filters))
+        if key in self.results:
+            self.hits += 1
+        else:
+            self.misses += 1
+            with metrics.stage('derive'):
+                self.dataset.add_measure(measure)
+            with metrics.stage('filter'):
+                data = self.dataset.query(**filters)
+            with metrics.stage('aggregate'):
+                self.results[key] = data.groupby(list(dims), observed=True)[measure].agg(agg)
+
+        # Charts reshape what they get back, so hand out copies of the stored result
+        return self.results[key].copy()
+
+    def forecast(self, baseline_year, horizon=FORECAST_HORIZON, **filters):
+        # Projected % change vs baseline_year of every (geo, nace_r2, c_resid) series matching
+        # filters, fitted as one batch from the nights rollup. The rollup goes through rollup(),
+        # so it is shared, memoized and recorded like any other; the fit is memoized beside it.
+        history = self.rollup('obs_value', 'sum', FORECAST_DIMS + ['date'], unit='NR', **filters)
+        key = (baseline_year, horizon) + cache_key('obs_value', 'sum', FORECAST_DIMS, filters)[3:]
+        if key in self.forecasts:
+            self.hits += 1
+        else:
+            self.misses += 1
+            with metrics.stage('forecast'):
+                self.forecasts[key] = forecast_recovery(history, baseline_year, horizon)
+        return self.forecasts[key].copy()
+
+    def start_recording(self):
+        # Collect the spec of every rollup requested until stop_recording()
+        self.recorded = []
+
+    def stop_recording(self):
+        recorded, self.recorded = self.recorded or [], None
+        return recorded
+
+    def rollup_from_spec(self, spec):
+        return self.rollup(spec['measure'], spec['agg'], spec['dims'], **spec['filters'])
+
+    def summary(self):
+        return f"{self.misses} aggregates computed, {self.hits} reused"
@@ -0,0 +1,123 @@
+from tourism_indicators import BASE_UNIT, indicator_values, parse_indicator
+import pandas as pd
+import numpy as np
+import itertools
+
+# Dimensions that identify one monthly series, in sort order
+KEY_COLUMNS = ['unit', 'nace_r2', 'c_resid', 'geo']
+
+def as_list(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, int, np.integer)):
+        return [value]
+    return list(value)
+
+def run_bounds(codes):
+    # Start/stop positions of the runs of identical rows in an (n_rows, n_cols) code matrix
+    n_rows = len(codes)
+    starts_mask = np.ones(n_rows, dtype=bool)
+    starts_mask[1:] = (codes[1:] != codes[:-1]).any(axis=1)
+    starts = np.flatnonzero(starts_mask)
+    return starts, np.append(starts[1:], n_rows)
+
+class TourismDataset:
+    # The cleaned frame sorted once by (unit, nace_r2, c_resid, geo, date). The contiguous
+    # row range of every series, and of every year within a series, is kept in a dict, so
+    # a query is a handful of dict lookups instead of a boolean mask over every row.
+
+    def __init__(self, df):
+        self.df = df.sort_values(KEY_COLUMNS + ['date'], kind='stable').reset_index(drop=True)
+        self.series_slices = {}
+        self.year_slices = {}
+        self.dimension_values = {col: [] for col in KEY_COLUMNS}
+        if len(self.df):
+            self._build_slices()
+
+    def _build_slices(self):
+        key_codes = []
+        key_labels = []
+        for col in KEY_COLUMNS:
+            codes, labels = pd.factorize(self.df[col], sort=False)
+            key_codes.append(codes)
+            key_labels.append(np.asarray(labels, dtype=object).astype(str))
+        key_codes = np.column_stack(key_codes)
+
+        def labels_at(starts):
+            return [labels[key_codes[starts, position]].tolist() for position, labels in enumerate(key_labels)]
+
+        starts, stops = run_bounds(key_codes)
+        keys = zip(*labels_at(starts))
+        self.series_slices = dict(zip(keys, zip(starts.tolist(), stops.tolist())))
+
+        years = self.df['year'].to_numpy()
+        starts, stops = run_bounds(np.column_stack([key_codes, years]))
+        keys = zip(*labels_at(starts), years[starts].tolist())
+        self.year_slices = dict(zip(keys, zip(starts.tolist(), stops.tolist())))
+
+        for position, col in enumerate(KEY_COLUMNS):
+            self.dimension_values[col] = sorted({key[position] for key in self.series_slices})
+
+    def add_measure(self, measure):
+        # Indicator measures (tourism_indicators.py) become a column of the frame the first time
+        # they are asked for; they are computed over the whole BASE_UNIT block, which is
+        # contiguous because unit is the first sort key, and left NaN for other units
+        if measure in self.df.columns:
+            return
+        if parse_indicator(measure) is None:
+            raise ValueError(f"Unknown measure: {measure}")
+        bounds = [bounds for key, bounds in self.series_slices.items() if key[0] == BASE_UNIT]
+        values = np.full(len(self.df), np.nan, dtype=np.float32)
+        if bounds:
+            lo, hi = min(start for start, _ in bounds), max(stop for _, stop in bounds)
+            values[lo:hi] = indicator_values(self.df.iloc[lo:hi], measure)
+        self.df[measure] = values
+
+    def measure_values(self, rows, measure):
+        # Indicator values of rows taken from query() without a year filter, so every series is
+        # whole; computed on those rows alone, leaving the shared frame as it is
+        if parse_indicator(measure) is None:
+            raise ValueError(f"Unknown measure: {measure}")
+        values = np.full(len(rows), np.nan, dtype=np.float32)
+        base = (rows['unit'] == BASE_UNIT).to_numpy()
+        if base.any():
+            values[base] = indicator_values(rows[base], measure)
+        return values
+
+    def values(self, column):
+        # Distinct values of a key column present in the data
+        return list(self.dimension_values[column])
+
+    def series_keys(self, unit=None, nace_r2=None, c_resid=None, geo=None):
+        # None on a dimension means every value present in the data
+        wanted = [as_list(codes) if codes is not None else self.dimension_values[col]
+                  for col, codes in zip(KEY_COLUMNS, (unit, nace_r2, c_resid, geo))]
+        return [key for key in itertools.product(*wanted) if key in self.series_slices]
+
+    def query(self, unit=None, nace_r2=None, c_resid=None, geo=None, years=None, year_range=None):
+        # Each dimension takes a code or a list of codes; years picks individual years,
+        # year_range an inclusive (first, last) span
+        if years is not None:
+            years = sorted(set(int(year) for year in as_list(years)))
+        elif year_range is not None:
+            years = list(range(year_range[0], year_range[1] + 1))
+
+        ranges = []
+        for key in self.series_keys(unit, nace_r2, c_resid, geo):
+            if years is None:
+                ranges.append(self.series_slices[key])
+                continue
+            for year in years:
+                bounds = self.year_slices.get(key + (year,))
+                if bounds is not None:
+                    ranges.append(bounds)
+
+        if not ranges:
+            return self.df.iloc[0:0]
+
+        # Expand the (lo, hi) ranges into row positions without a Python-level concatenate
+        lo, hi = np.array(ranges).T
+        lengths = hi - lo
+        shifts = lo - np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        positions = np.repeat(shifts, lengths) + np.arange(lengths.sum())
+        return self.df.iloc[positions]
@@ -0,0 +1,98 @@
+import pandas as pd
+import numpy as np
+
+# Months projected past the last month in the data
+FORECAST_HORIZON = 12
+
+# Models are fitted on the post-pandemic months only; 2020-2021 would teach them lockdowns
+FIT_START_YEAR = 2022
+
+# Smoothing weights tried for every series; each series keeps the pair with the lowest
+# one-step-ahead error
+ALPHAS = np.array([0.1, 0.3, 0.5, 0.8])
+GAMMAS = np.array([0.05, 0.2, 0.4])
+
+# Two-sided 80% band
+BAND_Z = 1.2816
+
+def month_grid(history, first_year):
+    # history: values indexed by (series dims..., date) -> series keys, monthly dates from
+    # first_year on and a (series x month) array with NaN where a month is missing
+    history = history[history.index.get_level_values('date').year >= first_year].dropna()
+    names = history.index.names[:-1]
+    if history.empty:
+        return pd.MultiIndex.from_tuples([], names=names), pd.DatetimeIndex([]), np.empty((0, 0))
+    frame = history.reset_index()
+    codes, series = pd.MultiIndex.from_frame(frame[names]).factorize()
+    series = pd.MultiIndex.from_tuples(list(series), names=names)
+    dates = pd.date_range(frame['date'].min(), frame['date'].max(), freq='MS')
+    positions = (frame['date'].dt.year - dates[0].year) * 12 + frame['date'].dt.month - dates[0].month
+    grid = np.full((len(series), len(dates)), np.nan)
+    grid[codes, positions.to_numpy()] = frame[history.name].to_numpy()
+    return series, dates, grid
+
+def fit_seasonal(log_grid):
+    # Additive level + seasonal exponential smoothing. Every series and every (alpha, gamma)
+    # pair steps through the months together, as (pairs x series) arrays, so the only Python
+    # loop is over time. A missing month leaves the state as it was.
+    n_series, n_months = log_grid.shape
+    alpha = np.repeat(ALPHAS, len(GAMMAS))[:, None]
+    gamma = np.tile(GAMMAS, len(ALPHAS))[:, None]
+
+    first_year = log_grid[:, :12]
+    observed = ~np.isnan(first_year)
+    start = np.where(observed, first_year, 0.0).sum(axis=1) / np.maximum(observed.sum(axis=1), 1)
+    start[~observed.any(axis=1)] = np.nan
+    level = np.tile(start, (len(alpha), 1))
+    season = np.tile(np.where(observed, first_year - start[:, None], 0.0).T, (len(alpha), 1, 1))
+    sse = np.zeros((len(alpha), n_series))
+    count = np.zeros(n_series)
+
+    for t in range(n_months):
+        observed = ~np.isnan(log_grid[:, t])
+        error = np.where(observed, log_grid[:, t] - level - season[:, t % 12], 0.0)
+        if t >= 12:
+            # The first year only initialises the seasonal pattern
+            sse += error ** 2
+            count += observed
+        level += alpha * error
+        season[:, t % 12] += gamma * (1 - alpha) * error
+
+    best = np.argmin(sse, axis=0)
+    every = np.arange(n_series)
+    sigma = np.sqrt(sse[best, every] / np.maximum(count, 1))
+    sigma[count < 6] = np.nan
+    return level[best, every], season[best, :, every], alpha[best, 0], sigma
+
+def forecast_recovery(history, baseline_year, horizon=FORECAST_HORIZON, first_year=FIT_START_YEAR):
+    # history: monthly nights indexed by (series dims..., date), covering baseline_year.
+    # Returns the projected % change vs the same month of baseline_year with an 80% band,
+    # indexed like history, for the horizon months after the last month in the data
+    columns = ['forecast', 'lower', 'upper']
+    series, dates, grid = month_grid(history, first_year)
+    if not len(series) or len(dates) < 24:
+        return pd.DataFrame(columns=columns, index=pd.MultiIndex.from_tuples([], names=history.index.names))
+
+    with np.errstate(divide='ignore'):
+        log_grid = np.where(grid > 0, np.log(np.where(grid > 0, grid, 1.0)), np.nan)
+    level, season, alpha, sigma = fit_seasonal(log_grid)
+
+    future = pd.date_range(dates[-1] + pd.offsets.MonthBegin(), periods=horizon, freq='MS')
+    steps = np.arange(1, horizon + 1)
+    log_forecast = level[:, None] + season[:, (len(dates) + steps - 1) % 12]
+    spread = BAND_Z * sigma[:, None] * np.sqrt(1 + (steps - 1) * alpha[:, None] ** 2)
+
+    # (series x calendar month) baseline nights, read at each forecast month
+    base_rows = history[history.index.get_level_values('date').year == baseline_year]
+    codes = series.get_indexer(base_rows.index.droplevel('date'))
+    months = base_rows.index.get_level_values('date').month.to_numpy()
+    baseline = np.full((len(series), 12), np.nan)
+    baseline[codes[codes >= 0], months[codes >= 0] - 1] = base_rows.to_numpy()[codes >= 0]
+    baseline = baseline[:, future.month - 1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = {name: ((np.exp(log_forecast + shift) / baseline - 1) * 100).ravel()
+                  for name, shift in zip(columns, (0, -spread, spread))}
+    index = series.to_frame(index=False).iloc[np.repeat(np.arange(len(series)), horizon)].reset_index(drop=True)
+    index['date'] = np.tile(future, len(series))
+    return pd.DataFrame(result, index=pd.MultiIndex.from_frame(index)).dropna()
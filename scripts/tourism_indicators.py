@@ -0,0 +1,79 @@
+import pandas as pd
+import numpy as np
+import re
+
+# Unit the indicators are derived from; every other unit gets no indicator values
+BASE_UNIT = 'NR'
+
+# Columns that identify one monthly series besides the unit
+SERIES_COLUMNS = ['nace_r2', 'c_resid', 'geo']
+
+# Indicator measures, usable wherever the cube takes a measure name:
+#   pct_vs_2019      % change vs the same month of 2019 (what Eurostat publishes as PCH_SM_19)
+#   pct_vs_2019-08   % change vs August 2019
+#   yoy              % change vs the same month a year earlier
+#   index_2019       index, 2019 monthly average = 100 (undefined for series missing a 2019 month)
+#   index_2019-08    index, August 2019 = 100
+INDICATOR_PATTERN = re.compile(r'(pct_vs|index)_(\d{4})(?:-(\d{2}))?|yoy')
+
+def parse_indicator(measure):
+    # (kind, base_year, base_month) of an indicator measure, None for anything else
+    match = INDICATOR_PATTERN.fullmatch(measure)
+    if not match:
+        return None
+    if measure == 'yoy':
+        return 'yoy', None, None
+    kind, year, month = match.groups()
+    if month is not None and not 1 <= int(month) <= 12:
+        return None
+    return kind, int(year), int(month) if month else None
+
+def series_codes(df):
+    # Dense id of each row's series: the categorical codes of the series columns combined into
+    # one integer, then renumbered
+    combined = np.zeros(len(df), dtype=np.int64)
+    for col in SERIES_COLUMNS:
+        codes, labels = pd.factorize(df[col], sort=False)
+        combined = combined * max(len(labels), 1) + codes
+    ids, keys = pd.factorize(combined, sort=False)
+    return ids, len(keys)
+
+def indicator_values(df, measure):
+    # Indicator of every row of df (one unit only) for all series at once. The values go into
+    # a (series x month) grid, so each row's baseline is one fancy-indexed read of the grid
+    kind, base_year, base_month = parse_indicator(measure)
+    result = np.full(len(df), np.nan)
+    if not len(df):
+        return result
+
+    ids, n_series = series_codes(df)
+    years = df['year'].to_numpy().astype(np.int64)
+    first_year = years.min()
+    periods = (years - first_year) * 12 + df['month'].to_numpy().astype(np.int64) - 1
+    n_periods = periods.max() + 1
+    grid = np.full((n_series, n_periods + 12), np.nan)
+    values = df['obs_value'].to_numpy().astype(np.float64)
+    grid[ids, periods] = values
+
+    def base_column(year, month):
+        period = (year - first_year) * 12 + month - 1
+        return period if 0 <= period < n_periods else n_periods
+
+    if kind == 'yoy':
+        # Periods 12 back from the first year land in the empty padding columns at the end
+        base = grid[ids, np.where(periods >= 12, periods - 12, n_periods)]
+    elif base_month is not None:
+        base = grid[ids, base_column(base_year, base_month)]
+    elif kind == 'pct_vs':
+        base_periods = np.array([base_column(base_year, month) for month in range(1, 13)])
+        base = grid[ids, base_periods[periods % 12]]
+    else:
+        base_periods = [base_column(base_year, month) for month in range(1, 13)]
+        base = grid[:, base_periods].mean(axis=1)[ids]
+
+    valid = base > 0
+    if kind == 'index':
+        result[valid] = values[valid] / base[valid] * 100
+    else:
+        result[valid] = (values[valid] / base[valid] - 1) * 100
+    return result.astype(np.float32)